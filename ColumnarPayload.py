@@ -0,0 +1,224 @@
+import json
+from typing import Dict, List
+
+# Marks a payload produced by encode_columnar, checked by decodeClassData in the template
+COLUMNAR_FORMAT = 'columnar'
+COLUMNAR_VERSION = 1
+# Template function that turns the columnar payload back into Cytoscape elements
+COLUMNAR_DECODER = 'decodeClassData'
+
+# Integers per edge in the flat edge array: source, target, type, color, count
+EDGE_STRIDE = 5
+
+# Column value meaning "derive from the class name", used for labels and descriptions
+DERIVED = -1
+
+NODE_KEYS = {'id', 'label', 'type', 'description', 'backgroundColor', 'borderColor', 'position',
+             'methods', 'attributes'}
+EDGE_KEYS = {'source', 'target', 'type', 'color', 'count', 'label'}
+METHOD_KEYS = {'name', 'visibility', 'params'}
+ATTRIBUTE_KEYS = {'name', 'visibility'}
+
+
+class StringTable:
+    """Interns strings into a list, handing out their indexes"""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self.indexes: Dict[str, int] = {}
+
+    def index(self, text: str) -> int:
+        index = self.indexes.get(text)
+        if index is None:
+            index = self.indexes[text] = len(self.strings)
+            self.strings.append(text)
+        return index
+
+
+def default_label(class_name: str) -> str:
+    return class_name.split('.')[-1]
+
+
+def default_description(class_name: str, class_type: str) -> str:
+    return f'{class_type.capitalize()} {class_name}'
+
+
+def edge_label(edge_type: str, count: int) -> str:
+    return edge_type if count == 1 else f"{edge_type} ({count}x)"
+
+
+def encode_members(node_data: dict):
+    """Members of a class as a compact JSON string.
+
+    None means there are no members to encode (as in --lazy-members
+    skeletons) or they do not fit the compact form.
+
+    The string is kept unparsed in the payload, so the viewer only pays for
+    parsing the members of classes the user actually opens.
+    """
+    if 'methods' not in node_data and 'attributes' not in node_data:
+        return None
+    methods = node_data.get('methods', [])
+    attributes = node_data.get('attributes', [])
+    if any(set(method) != METHOD_KEYS for method in methods) or \
+            any(set(attribute) != ATTRIBUTE_KEYS for attribute in attributes):
+        return None
+    if not methods and not attributes:
+        return ''
+    return json.dumps([[[m['visibility'], m['name'], m['params']] for m in methods],
+                       [[a['visibility'], a['name']] for a in attributes]], separators=(',', ':'))
+
+
+def encode_columnar(diagram_data: dict) -> dict:
+    """Encode interactive diagram data as string tables and integer columns.
+
+    Class names, colors and type names are stored once and referenced by
+    index, edges become one flat integer array, and values the decoder can
+    derive (labels, descriptions, edge labels) are left out. Anything that
+    does not fit a column is kept per element in a sparse extras map, so
+    decoding always restores the original data.
+    """
+    strings = StringTable()
+    colors = StringTable()
+    node_types = StringTable()
+    edge_types = StringTable()
+
+    columns = {key: [] for key in ('id', 'label', 'type', 'description', 'backgroundColor',
+                                   'borderColor', 'x', 'y', 'members')}
+    node_extras = {}
+    for index, node in enumerate(diagram_data['nodes']):
+        node_data = node['data']
+        class_name = node_data['id']
+        class_type = node_data['type']
+        position = node_data.get('position', {'x': 0, 'y': 0})
+        members = encode_members(node_data)
+
+        columns['id'].append(strings.index(class_name))
+        columns['label'].append(DERIVED if node_data['label'] == default_label(class_name)
+                                else strings.index(node_data['label']))
+        columns['type'].append(node_types.index(class_type))
+        description = node_data.get('description')
+        columns['description'].append(
+            DERIVED if description is None or description == default_description(class_name, class_type)
+            else strings.index(description))
+        columns['backgroundColor'].append(colors.index(node_data['backgroundColor']))
+        columns['borderColor'].append(colors.index(node_data['borderColor']))
+        columns['x'].append(position['x'])
+        columns['y'].append(position['y'])
+        columns['members'].append(members)
+
+        extras = {key: value for key, value in node_data.items() if key not in NODE_KEYS}
+        if 'position' not in node_data:
+            extras['position'] = None
+        if 'description' not in node_data:
+            extras['description'] = None
+        if members is None and ('methods' in node_data or 'attributes' in node_data):
+            extras['methods'] = node_data.get('methods', [])
+            extras['attributes'] = node_data.get('attributes', [])
+        if extras:
+            node_extras[index] = extras
+
+    edges = []
+    edge_extras = {}
+    for index, edge in enumerate(diagram_data['edges']):
+        edge_data = edge['data']
+        count = edge_data.get('count', 1)
+        edges.extend((strings.index(edge_data['source']), strings.index(edge_data['target']),
+                      edge_types.index(edge_data['type']), colors.index(edge_data['color']), count))
+
+        extras = {key: value for key, value in edge_data.items() if key not in EDGE_KEYS}
+        if edge_data.get('label') != edge_label(edge_data['type'], count):
+            extras['label'] = edge_data.get('label')
+        if 'count' not in edge_data:
+            extras['count'] = None
+        if extras:
+            edge_extras[index] = extras
+
+    return {
+        'format': COLUMNAR_FORMAT,
+        'version': COLUMNAR_VERSION,
+        'strings': strings.strings,
+        'colors': colors.strings,
+        'nodeTypes': node_types.strings,
+        'edgeTypes': edge_types.strings,
+        'nodes': columns,
+        'nodeExtras': node_extras,
+        'edges': edges,
+        'edgeStride': EDGE_STRIDE,
+        'edgeExtras': edge_extras,
+        'meta': {key: value for key, value in diagram_data.items() if key not in ('nodes', 'edges')},
+    }
+
+
+def decode_members(encoded: str) -> dict:
+    methods, attributes = json.loads(encoded) if encoded else ([], [])
+    return {
+        'methods': [{'name': name, 'visibility': visibility, 'params': params}
+                    for visibility, name, params in methods],
+        'attributes': [{'name': name, 'visibility': visibility} for visibility, name in attributes],
+    }
+
+
+def apply_extras(data: dict, extras: dict):
+    """Overlay per-element extras; None marks a key that was absent originally"""
+    for key, value in extras.items():
+        if value is None:
+            data.pop(key, None)
+        else:
+            data[key] = value
+
+
+def decode_columnar(payload: dict) -> dict:
+    """Rebuild interactive diagram data from encode_columnar output.
+
+    Mirrors decodeClassData in template.html, except that members are
+    decoded eagerly.
+    """
+    if payload.get('format') != COLUMNAR_FORMAT:
+        return payload
+
+    strings = payload['strings']
+    colors = payload['colors']
+    columns = payload['nodes']
+    node_extras = {int(index): extras for index, extras in payload['nodeExtras'].items()}
+    edge_extras = {int(index): extras for index, extras in payload['edgeExtras'].items()}
+
+    nodes = []
+    for index, string_index in enumerate(columns['id']):
+        class_name = strings[string_index]
+        class_type = payload['nodeTypes'][columns['type'][index]]
+        label = columns['label'][index]
+        description = columns['description'][index]
+        node_data = {
+            'id': class_name,
+            'label': default_label(class_name) if label == DERIVED else strings[label],
+            'type': class_type,
+            'description': (default_description(class_name, class_type) if description == DERIVED
+                            else strings[description]),
+            'backgroundColor': colors[columns['backgroundColor'][index]],
+            'borderColor': colors[columns['borderColor'][index]],
+            'position': {'x': columns['x'][index], 'y': columns['y'][index]},
+        }
+        if columns['members'][index] is not None:
+            node_data.update(decode_members(columns['members'][index]))
+        apply_extras(node_data, node_extras.get(index, {}))
+        nodes.append({'data': node_data})
+
+    edges = []
+    flat_edges = payload['edges']
+    stride = payload['edgeStride']
+    for index, offset in enumerate(range(0, len(flat_edges), stride)):
+        source, target, type_index, color, count = flat_edges[offset:offset + EDGE_STRIDE]
+        edge_type = payload['edgeTypes'][type_index]
+        edge_data = {
+            'source': strings[source],
+            'target': strings[target],
+            'type': edge_type,
+            'color': colors[color],
+            'count': count,
+            'label': edge_label(edge_type, count),
+        }
+        apply_extras(edge_data, edge_extras.get(index, {}))
+        edges.append({'data': edge_data})
+
+    return {**payload.get('meta', {}), 'nodes': nodes, 'edges': edges}
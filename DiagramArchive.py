@@ -0,0 +1,183 @@
+import argparse
+import json
+import os
+import struct
+import sys
+import zipfile
+from typing import Dict, Iterable, List
+
+INDEX_NAME = 'index.json'
+INDEX_VERSION = 1
+# The archive comment points at the index, so readers find it without the central directory
+INDEX_COMMENT_PREFIX = b'diagram-index:'
+
+WRITE_BUFFER_SIZE = 1 << 20
+END_RECORD_SIGNATURE = b'PK\x05\x06'
+END_RECORD_SIZE = 22
+MAX_COMMENT_SIZE = 0xFFFF
+
+
+def archive_root(input_files: Iterable[str]) -> str:
+    """Directory that entry names are relative to: the common directory of the inputs"""
+    return os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in input_files])
+
+
+class AppendOnlyFile:
+    """A write-only view of a file that cannot seek.
+
+    zipfile rewrites each local header after its data when it can seek,
+    which flushes the write buffer once per entry. Without seeking it
+    appends the sizes in a data descriptor after the data instead, so the
+    whole archive goes through the buffer front to back.
+    """
+
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, data) -> int:
+        return self.file.write(data)
+
+    def tell(self) -> int:
+        return self.file.tell()
+
+    def flush(self):
+        self.file.flush()
+
+
+class ArchiveWriter:
+    """Write the outputs of many inputs into one uncompressed zip archive.
+
+    Outputs are stored rather than deflated, so every entry is a contiguous
+    byte range of the archive; index.json records the offset and size of each
+    one and which input produced it. The archive is written front to back
+    through one buffered file under a temporary name, synced once and renamed
+    into place by close(), so readers never see a partial archive.
+    """
+
+    def __init__(self, path: str, root: str):
+        self.path = path
+        self.root = root
+        self.temp_path = f"{path}.tmp"
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.file = open(self.temp_path, 'wb', buffering=WRITE_BUFFER_SIZE)
+        self.zip_file = zipfile.ZipFile(AppendOnlyFile(self.file), 'w', compression=zipfile.ZIP_STORED)
+        self.entries: Dict[str, List[int]] = {}
+        self.inputs: Dict[str, List[str]] = {}
+
+    def entry_name(self, path: str) -> str:
+        return os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, '/')
+
+    def _write_entry(self, name: str, data: bytes) -> List[int]:
+        with self.zip_file.open(name, 'w') as entry:
+            # The local header is written on open, so stored data starts here
+            offset = self.file.tell()
+            entry.write(data)
+        return [offset, len(data)]
+
+    def add_outputs(self, input_file: str, outputs: Dict[str, str]):
+        """Add the outputs of one input, as returned by render_outputs"""
+        names = self.inputs.setdefault(self.entry_name(input_file), [])
+        for path, text in outputs.items():
+            name = self.entry_name(path)
+            self.entries[name] = self._write_entry(name, text.encode('utf-8'))
+            names.append(name)
+
+    def close(self) -> int:
+        """Write the index, sync once and move the archive into place; returns the entry count"""
+        index = {'version': INDEX_VERSION, 'inputs': self.inputs, 'entries': self.entries}
+        offset, size = self._write_entry(INDEX_NAME, json.dumps(index, separators=(',', ':')).encode('utf-8'))
+        self.zip_file.comment = INDEX_COMMENT_PREFIX + f"{offset}:{size}".encode('ascii')
+        self.zip_file.close()
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        os.replace(self.temp_path, self.path)
+        return len(self.entries)
+
+    def discard(self):
+        """Drop a partly written archive"""
+        self.zip_file.close()
+        self.file.close()
+        os.remove(self.temp_path)
+
+
+class ArchiveReader:
+    """Read single entries of an archive written by ArchiveWriter.
+
+    Opening reads only the end of the file and the index; each read is one
+    seek into the archive, whatever its size.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.index = json.loads(self._read_range(*self._index_range()))
+
+    def _index_range(self):
+        archive_size = self.file.seek(0, os.SEEK_END)
+        tail_size = min(archive_size, END_RECORD_SIZE + MAX_COMMENT_SIZE)
+        self.file.seek(archive_size - tail_size)
+        tail = self.file.read(tail_size)
+
+        end_record = tail.rfind(END_RECORD_SIGNATURE)
+        comment_size = struct.unpack('<H', tail[end_record + 20:end_record + 22])[0] if end_record != -1 else 0
+        comment = tail[end_record + END_RECORD_SIZE:end_record + END_RECORD_SIZE + comment_size]
+        if end_record == -1 or not comment.startswith(INDEX_COMMENT_PREFIX):
+            raise ValueError(f"{self.path} is not a diagram archive")
+        offset, size = comment[len(INDEX_COMMENT_PREFIX):].split(b':')
+        return int(offset), int(size)
+
+    def _read_range(self, offset: int, size: int) -> bytes:
+        self.file.seek(offset)
+        return self.file.read(size)
+
+    def names(self) -> List[str]:
+        return list(self.index['entries'])
+
+    def inputs(self) -> Dict[str, List[str]]:
+        """Entry names of the outputs of each input"""
+        return self.index['inputs']
+
+    def read(self, name: str) -> str:
+        entry = self.index['entries'].get(name)
+        if entry is None:
+            raise KeyError(f"{name} is not in {self.path}")
+        return self._read_range(*entry).decode('utf-8')
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='List or extract entries of a diagram archive')
+    parser.add_argument('archive', help='Archive written by converter.py --archive')
+    parser.add_argument('names', nargs='*', help='Entries to print (default: list the archive by input)')
+
+    args = parser.parse_args()
+
+    try:
+        with ArchiveReader(args.archive) as reader:
+            if not args.names:
+                for input_name, names in reader.inputs().items():
+                    print(input_name)
+                    for name in names:
+                        print(f"    {name}")
+            for name in args.names:
+                sys.stdout.write(reader.read(name))
+    except KeyError as e:
+        print(f"Error: {e.args[0]}", file=sys.stderr)
+        sys.exit(1)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
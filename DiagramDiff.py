@@ -0,0 +1,207 @@
+import argparse
+import os
+import sys
+from typing import Dict, List, NamedTuple, Set, Tuple
+
+from DiagramGraph import MERMAID_ARROWS, diagram_to_mermaid, mermaid_id
+from HtmlBundler import DEFAULT_TEMPLATE_PATH
+from IncludeResolver import read_puml
+from InteractiveDiagramConverter import InteractiveDiagramConverter, write_interactive_html
+
+ADDED = 'added'
+REMOVED = 'removed'
+MODIFIED = 'modified'
+
+# (background, border) per change; unchanged neighbors are shown greyed out
+CHANGE_COLORS = {
+    ADDED: ('#C8E6C9', '#2E7D32'),
+    REMOVED: ('#FFCDD2', '#C62828'),
+    MODIFIED: ('#FFE0B2', '#EF6C00'),
+    None: ('#EEEEEE', '#9E9E9E'),
+}
+
+EdgeKey = Tuple[str, str, str]
+
+
+class ModelIndex:
+    """Classes keyed by fully qualified name and edges keyed by (source, target, type)"""
+
+    def __init__(self, diagram_data: dict):
+        self.classes: Dict[str, dict] = {node['data']['id']: node['data'] for node in diagram_data['nodes']}
+        self.edges: Dict[EdgeKey, dict] = {}
+        for edge in diagram_data['edges']:
+            edge_data = edge['data']
+            self.edges[(edge_data['source'], edge_data['target'], edge_data['type'])] = edge_data
+
+
+def member_signatures(node_data: dict) -> Set[str]:
+    """Members of a class as comparable one-line signatures"""
+    signatures = {f"{method['visibility']}{method['name']}{method['params']}"
+                  for method in node_data.get('methods', [])}
+    signatures.update(f"{attribute['visibility']}{attribute['name']}"
+                      for attribute in node_data.get('attributes', []))
+    return signatures
+
+
+class ModelDiff(NamedTuple):
+    old: ModelIndex
+    new: ModelIndex
+    classes: Dict[str, str]                 # class name -> change
+    members: Dict[str, Tuple[List[str], List[str]]]  # class name -> (added, removed) members
+    edges: Dict[EdgeKey, str]               # edge key -> change
+
+    def summary(self) -> str:
+        def count(changes, kind):
+            return sum(1 for change in changes.values() if change == kind)
+        return (f"Classes: {count(self.classes, ADDED)} added, {count(self.classes, REMOVED)} removed, "
+                f"{count(self.classes, MODIFIED)} modified; relationships: {count(self.edges, ADDED)} added, "
+                f"{count(self.edges, REMOVED)} removed, {count(self.edges, MODIFIED)} modified")
+
+
+def diff_models(old_data: dict, new_data: dict) -> ModelDiff:
+    """Compare two versions of a model in time linear in their size"""
+    old, new = ModelIndex(old_data), ModelIndex(new_data)
+
+    classes = {}
+    members = {}
+    for class_name, node_data in new.classes.items():
+        old_node = old.classes.get(class_name)
+        if old_node is None:
+            classes[class_name] = ADDED
+            continue
+        old_members, new_members = member_signatures(old_node), member_signatures(node_data)
+        if old_members != new_members or old_node['type'] != node_data['type']:
+            classes[class_name] = MODIFIED
+            members[class_name] = (sorted(new_members - old_members), sorted(old_members - new_members))
+    for class_name in old.classes.keys() - new.classes.keys():
+        classes[class_name] = REMOVED
+
+    edges = {}
+    for key, edge_data in new.edges.items():
+        old_edge = old.edges.get(key)
+        if old_edge is None:
+            edges[key] = ADDED
+        elif old_edge.get('count', 1) != edge_data.get('count', 1):
+            edges[key] = MODIFIED
+    for key in old.edges.keys() - new.edges.keys():
+        edges[key] = REMOVED
+
+    return ModelDiff(old, new, classes, members, edges)
+
+
+def diff_diagram(diff: ModelDiff, hops: int = 1) -> dict:
+    """Diagram data of the changed classes and relationships plus their neighbors.
+
+    Every node and edge carries a 'change' ('added', 'removed', 'modified'
+    or None for context) and is colored accordingly.
+    """
+    all_edges = {**diff.old.edges, **diff.new.edges}
+    selected = set(diff.classes)
+    for source, target, _ in diff.edges:
+        selected.update((source, target))
+    for _ in range(hops):
+        neighbors = set()
+        for source, target, _ in all_edges:
+            if source in selected:
+                neighbors.add(target)
+            if target in selected:
+                neighbors.add(source)
+        selected |= neighbors
+
+    nodes = []
+    for class_name in sorted(selected):
+        node_data = diff.new.classes.get(class_name) or diff.old.classes.get(class_name)
+        if node_data is None:
+            continue
+        change = diff.classes.get(class_name)
+        background, border = CHANGE_COLORS[change]
+        node_data = dict(node_data, change=change, backgroundColor=background, borderColor=border)
+        if class_name in diff.members:
+            added, removed = diff.members[class_name]
+            node_data['memberChanges'] = {ADDED: added, REMOVED: removed}
+            node_data['description'] = f"{node_data['description']} (+{len(added)} / -{len(removed)} members)"
+        nodes.append({'data': node_data})
+
+    edges = []
+    for key in sorted(all_edges):
+        source, target, _ = key
+        if source not in selected or target not in selected:
+            continue
+        change = diff.edges.get(key)
+        edge_data = dict(all_edges[key], change=change, color=CHANGE_COLORS[change][1])
+        if change:
+            edge_data['label'] = f"{edge_data['label']} [{change}]"
+        edges.append({'data': edge_data})
+
+    return {'nodes': nodes, 'edges': edges}
+
+
+def diff_to_mermaid(diagram_data: dict) -> str:
+    """Render diff_diagram output as a Mermaid class diagram with the changes styled"""
+    lines = [diagram_to_mermaid({'nodes': diagram_data['nodes'], 'edges': []})]
+
+    for edge in diagram_data['edges']:
+        edge_data = edge['data']
+        arrow = MERMAID_ARROWS.get(edge_data['type'], '-->')
+        label = f" : {edge_data['change']}" if edge_data['change'] else ''
+        lines.append(f"    {mermaid_id(edge_data['source'])} {arrow} {mermaid_id(edge_data['target'])}{label}")
+
+    for node in diagram_data['nodes']:
+        node_data = node['data']
+        class_id = mermaid_id(node_data['id'])
+        lines.append(f"    style {class_id} fill:{node_data['backgroundColor']},stroke:{node_data['borderColor']}")
+        member_changes = node_data.get('memberChanges')
+        if member_changes:
+            note = [f"added {member}" for member in member_changes[ADDED]]
+            note += [f"removed {member}" for member in member_changes[REMOVED]]
+            note_text = '<br>'.join(note).replace('"', "'")
+            lines.append(f'    note for {class_id} "{note_text}"')
+
+    return '\n'.join(lines)
+
+
+def load_model(path: str, resolve_includes: bool = False) -> dict:
+    puml_content = read_puml(path, resolve_includes)
+    return InteractiveDiagramConverter().convert_to_interactive(puml_content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show what changed between two versions of a PlantUML class diagram')
+    parser.add_argument('old_file', help='Old version of the PlantUML model')
+    parser.add_argument('new_file', help='New version of the PlantUML model')
+    parser.add_argument('--hops', type=int, default=1,
+                        help='Unchanged neighbors shown around each change, in edges (default: 1)')
+    parser.add_argument('--format', '-f', choices=['mermaid', 'interactive'], default='mermaid',
+                        help='Output format (default: mermaid)')
+    parser.add_argument('--template', help='Path to HTML template file for interactive output',
+                        default=DEFAULT_TEMPLATE_PATH)
+    parser.add_argument('--output', '-o', help='Output file (default: stdout for Mermaid)')
+    parser.add_argument('--resolve-includes', action='store_true',
+                        help='Inline local !include files before comparing')
+
+    args = parser.parse_args()
+
+    try:
+        diff = diff_models(load_model(args.old_file, args.resolve_includes),
+                           load_model(args.new_file, args.resolve_includes))
+    except OSError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(diff.summary(), file=sys.stderr)
+    diagram_data = diff_diagram(diff, args.hops)
+
+    if args.format == 'interactive':
+        output_file = args.output or f"{os.path.splitext(args.new_file)[0]}_diff.html"
+        write_interactive_html(diagram_data, args.template, output_file)
+        print(f"Created interactive diagram: {output_file}", file=sys.stderr)
+    elif args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(diff_to_mermaid(diagram_data))
+        print(f"Created diagram: {args.output}", file=sys.stderr)
+    else:
+        print(diff_to_mermaid(diagram_data))
+
+
+if __name__ == "__main__":
+    main()
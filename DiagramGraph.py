@@ -0,0 +1,253 @@
+import argparse
+import os
+import re
+import sys
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Set
+
+from HtmlBundler import DEFAULT_TEMPLATE_PATH
+from InteractiveDiagramConverter import InteractiveDiagramConverter, write_interactive_html
+from RelationshipScanner import MERMAID_ARROWS
+
+
+class PackageTrie:
+    """Prefix trie of package names, each node holding the classes declared directly in it.
+
+    The root also indexes every package by the last part of its name, so
+    packages can be looked up by the end of their name without a full walk.
+    """
+
+    def __init__(self, name: str = ''):
+        self.name = name
+        self.children: Dict[str, 'PackageTrie'] = {}
+        self.classes: List[str] = []
+        self.by_last_part: Dict[str, List['PackageTrie']] = {}
+
+    def insert(self, class_name: str):
+        node = self
+        for part in class_name.split('.')[:-1]:
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = PackageTrie(f"{node.name}.{part}" if node.name else part)
+                self.by_last_part.setdefault(part, []).append(child)
+            node = child
+        node.classes.append(class_name)
+
+    def find(self, package: str):
+        """Return the trie node for a full package name, or None"""
+        node = self
+        for part in package.split('.'):
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
+
+    def find_suffix(self, package: str) -> List['PackageTrie']:
+        """Return the nodes of every package whose name ends with the given parts"""
+        suffix = f".{package}"
+        return [node for node in self.by_last_part.get(package.rsplit('.', 1)[-1], [])
+                if node.name == package or node.name.endswith(suffix)]
+
+    def iter_classes(self) -> Iterable[str]:
+        """Yield every class in this package and its subpackages"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield from node.classes
+            stack.extend(node.children.values())
+
+
+class DiagramGraph:
+    """Indexed graph over the output of InteractiveDiagramConverter.convert_to_interactive.
+
+    Queries walk adjacency lists and the package trie, so their cost is
+    proportional to the size of the result rather than the whole diagram.
+    """
+
+    def __init__(self, diagram_data: dict):
+        self.nodes: Dict[str, dict] = {}
+        self.outgoing: Dict[str, List[dict]] = defaultdict(list)
+        self.incoming: Dict[str, List[dict]] = defaultdict(list)
+        self.labels: Dict[str, List[str]] = defaultdict(list)
+        self.packages = PackageTrie()
+
+        for node in diagram_data['nodes']:
+            class_name = node['data']['id']
+            self.nodes[class_name] = node['data']
+            self.labels[node['data']['label']].append(class_name)
+            self.packages.insert(class_name)
+
+        for edge in diagram_data['edges']:
+            edge_data = edge['data']
+            self.outgoing[edge_data['source']].append(edge_data)
+            self.incoming[edge_data['target']].append(edge_data)
+
+    def resolve(self, name: str) -> List[str]:
+        """Resolve a fully qualified or simple class name to class ids"""
+        if name in self.nodes:
+            return [name]
+        matches = self.labels.get(name)
+        if not matches:
+            raise KeyError(f"Unknown class: {name}")
+        return matches
+
+    def neighborhood(self, name: str, hops: int = 1, direction: str = 'both') -> Set[str]:
+        """Classes within the given number of hops of a class"""
+        found = set(self.resolve(name))
+        frontier = deque((class_name, 0) for class_name in found)
+        while frontier:
+            class_name, distance = frontier.popleft()
+            if distance == hops:
+                continue
+            for neighbor in self._neighbors(class_name, direction):
+                if neighbor not in found:
+                    found.add(neighbor)
+                    frontier.append((neighbor, distance + 1))
+        return found
+
+    def package(self, package: str) -> Set[str]:
+        """Classes in a package and its subpackages.
+
+        A package that is not a full name matches every package ending with
+        it, so 'poa.repositories' finds 'za.co.ist.poa.repositories'.
+        """
+        node = self.packages.find(package)
+        if node is not None:
+            return set(node.iter_classes())
+
+        found = set()
+        for node in self.packages.find_suffix(package):
+            found.update(node.iter_classes())
+        if not found:
+            raise KeyError(f"Unknown package: {package}")
+        return found
+
+    def ancestors(self, name: str) -> Set[str]:
+        """A class and every class it inherits from, transitively"""
+        return self._inheritance_closure(name, self.outgoing, 'target')
+
+    def descendants(self, name: str) -> Set[str]:
+        """A class and every class inheriting from it, transitively"""
+        return self._inheritance_closure(name, self.incoming, 'source')
+
+    def subgraph(self, class_names: Iterable[str]) -> dict:
+        """Diagram data restricted to the given classes and the edges between them"""
+        selected = set(class_names)
+        nodes = []
+        edges = []
+        for class_name in sorted(selected):
+            node_data = self.nodes.get(class_name)
+            if node_data is not None:
+                nodes.append({'data': node_data})
+            for edge_data in self.outgoing.get(class_name, []):
+                if edge_data['target'] in selected:
+                    edges.append({'data': edge_data})
+        return {'nodes': nodes, 'edges': edges}
+
+    def _neighbors(self, class_name: str, direction: str) -> Iterable[str]:
+        if direction in ('out', 'both'):
+            for edge_data in self.outgoing.get(class_name, []):
+                yield edge_data['target']
+        if direction in ('in', 'both'):
+            for edge_data in self.incoming.get(class_name, []):
+                yield edge_data['source']
+
+    def _inheritance_closure(self, name: str, adjacency: Dict[str, List[dict]], end: str) -> Set[str]:
+        found = set(self.resolve(name))
+        stack = list(found)
+        while stack:
+            class_name = stack.pop()
+            for edge_data in adjacency.get(class_name, []):
+                if edge_data['type'] == 'inheritance' and edge_data[end] not in found:
+                    found.add(edge_data[end])
+                    stack.append(edge_data[end])
+        return found
+
+
+def mermaid_id(class_name: str) -> str:
+    """Mermaid-safe identifier that keeps classes from different packages apart"""
+    return re.sub(r'[^a-zA-Z0-9_]', '_', class_name)
+
+
+def diagram_to_mermaid(diagram_data: dict) -> str:
+    """Render interactive diagram data as a Mermaid class diagram"""
+    lines = ["classDiagram", "    direction TB"]
+    for node in diagram_data['nodes']:
+        node_data = node['data']
+        lines.append(f'    class {mermaid_id(node_data["id"])}["{node_data["label"]}"]')
+
+    for node in diagram_data['nodes']:
+        node_data = node['data']
+        class_id = mermaid_id(node_data['id'])
+        for attribute in node_data.get('attributes', []):
+            lines.append(f"    {class_id} : {attribute['visibility']}{attribute['name']}")
+        for method in node_data.get('methods', []):
+            lines.append(f"    {class_id} : {method['visibility']}{method['name']}{method['params']}")
+
+    for edge in diagram_data['edges']:
+        edge_data = edge['data']
+        arrow = MERMAID_ARROWS.get(edge_data['type'], '-->')
+        count = edge_data.get('count', 1)
+        label = f" : {count}x" if count > 1 else ''
+        lines.append(f"    {mermaid_id(edge_data['source'])} {arrow} {mermaid_id(edge_data['target'])}{label}")
+
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract a focused sub-diagram from a PlantUML class diagram')
+    parser.add_argument('input_file', help='Input PlantUML file path')
+    parser.add_argument('--focus', action='append', default=[], help='Class to center a neighborhood on')
+    parser.add_argument('--hops', type=int, default=1, help='Neighborhood radius in edges (default: 1)')
+    parser.add_argument('--direction', choices=['in', 'out', 'both'], default='both',
+                        help='Edge direction followed by --focus (default: both)')
+    parser.add_argument('--package', action='append', default=[], help='Package subtree to include')
+    parser.add_argument('--ancestors', action='append', default=[], help='Class whose inheritance ancestors to include')
+    parser.add_argument('--descendants', action='append', default=[], help='Class whose inheritance descendants to include')
+    parser.add_argument('--format', '-f', choices=['mermaid', 'interactive'], default='mermaid',
+                        help='Output format (default: mermaid)')
+    parser.add_argument('--template', help='Path to HTML template file for interactive output',
+                        default=DEFAULT_TEMPLATE_PATH)
+    parser.add_argument('--output', '-o', help='Output file (default: stdout for Mermaid)')
+
+    args = parser.parse_args()
+
+    if not (args.focus or args.package or args.ancestors or args.descendants):
+        parser.error('give at least one of --focus, --package, --ancestors or --descendants')
+
+    with open(args.input_file, 'r', encoding='utf-8') as f:
+        puml_content = f.read()
+
+    graph = DiagramGraph(InteractiveDiagramConverter().convert_to_interactive(puml_content))
+
+    try:
+        selected = set()
+        for name in args.focus:
+            selected |= graph.neighborhood(name, args.hops, args.direction)
+        for package in args.package:
+            selected |= graph.package(package)
+        for name in args.ancestors:
+            selected |= graph.ancestors(name)
+        for name in args.descendants:
+            selected |= graph.descendants(name)
+    except KeyError as e:
+        print(f"Error: {e.args[0]}")
+        sys.exit(1)
+
+    subgraph = graph.subgraph(selected)
+    print(f"Selected {len(subgraph['nodes'])} classes and {len(subgraph['edges'])} relationships", file=sys.stderr)
+
+    if args.format == 'interactive':
+        output_file = args.output or f"{os.path.splitext(args.input_file)[0]}_focus.html"
+        write_interactive_html(subgraph, args.template, output_file)
+        print(f"Created interactive diagram: {output_file}", file=sys.stderr)
+    elif args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(diagram_to_mermaid(subgraph))
+        print(f"Created diagram: {args.output}", file=sys.stderr)
+    else:
+        print(diagram_to_mermaid(subgraph))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
-import hashlib
-
 from InteractiveDiagramConverter import InteractiveDiagramConverter
+from StableHash import stable_bucket
 
 class EnhancedInteractiveDiagramConverter(InteractiveDiagramConverter):
     def __init__(self):
@@ -8,8 +7,7 @@ class EnhancedInteractiveDiagramConverter(InteractiveDiagramConverter):
 
     def hash_to_color(self, text, palette):
         """Hash a text to a color in the given palette."""
-        hashed_value = int(hashlib.md5(text.encode()).hexdigest(), 16)
-        return palette[hashed_value % len(palette)]
+        return palette[stable_bucket(text, len(palette))]
 
     def get_section_colors(self, class_name: str, class_type: str) -> tuple:
         """Determine colors based on package hierarchy and class type."""
@@ -0,0 +1,172 @@
+import argparse
+import os
+import re
+import urllib.request
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TEMPLATE_PATH = os.path.join(MODULE_DIR, 'template.html')
+DEFAULT_VENDOR_DIR = os.path.join(MODULE_DIR, 'vendor')
+
+# Where the interactive data is embedded in a template
+DATA_START_MARKER = "const classData = {"
+DATA_END_MARKER = "cy.add(classData.nodes);"
+
+
+class VendorScript(NamedTuple):
+    name: str
+    url: str
+    filename: str
+    usage: str  # regex matching inline template code that needs the script
+
+
+VENDOR_SCRIPTS = [
+    VendorScript('cytoscape', 'https://cdnjs.cloudflare.com/ajax/libs/cytoscape/3.26.0/cytoscape.min.js',
+                 'cytoscape.min.js', r'\bcytoscape\s*\('),
+    VendorScript('cytoscape-pdf', 'https://cdnjs.cloudflare.com/ajax/libs/cytoscape-pdf/0.3.0/cytoscape.pdf.min.js',
+                 'cytoscape.pdf.min.js', r'\bcytoscape\.exporters\b'),
+    VendorScript('jspdf', 'https://cdnjs.cloudflare.com/ajax/libs/jspdf/2.5.1/jspdf.umd.min.js',
+                 'jspdf.umd.min.js', r'\bjspdf\b'),
+    VendorScript('vue', 'https://cdnjs.cloudflare.com/ajax/libs/vue/3.4.15/vue.global.min.js',
+                 'vue.global.min.js', r'\bVue\.'),
+]
+
+SCRIPT_TAG_PATTERN = re.compile(r'[ \t]*<script src="([^"]+)"></script>\n?')
+INLINE_SCRIPT_PATTERN = re.compile(r'<script>(.*?)</script>', re.DOTALL)
+COMMENT_LINE_PATTERN = re.compile(r'^\s*//.*$')
+
+
+class CompiledTemplate(NamedTuple):
+    """Template text before and after the embedded diagram data"""
+    head: str
+    tail: str
+
+    def render(self, data_js: str) -> str:
+        return f"{self.head}const classData = {data_js};\n\n        {self.tail}"
+
+
+def vendor_script_for(url: str) -> Optional[VendorScript]:
+    for script in VENDOR_SCRIPTS:
+        if url == script.url or url.endswith('/' + script.filename):
+            return script
+    return None
+
+
+def minify_html(template: str) -> str:
+    """Drop indentation, blank lines and whole-line // comments.
+
+    Only whole lines are touched, so strings and URLs inside the code are
+    left alone.
+    """
+    lines = []
+    for line in template.splitlines():
+        line = line.strip()
+        if line and not COMMENT_LINE_PATTERN.match(line):
+            lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+def rewrite_vendor_scripts(template: str, render) -> str:
+    """Rewrite the known CDN script tags of a template.
+
+    Tags for libraries the template's inline code never uses are dropped,
+    the others are replaced by render(script).
+    """
+    code = '\n'.join(INLINE_SCRIPT_PATTERN.findall(template))
+
+    def replace(match):
+        script = vendor_script_for(match.group(1))
+        if script is None:
+            return match.group(0)
+        if not re.search(script.usage, code):
+            return ''
+        return render(script)
+
+    return SCRIPT_TAG_PATTERN.sub(replace, template)
+
+
+def vendor_script_path(vendor_dir: str, script: VendorScript) -> str:
+    """Path of a local vendor script, raising a helpful error when it is missing"""
+    path = os.path.join(vendor_dir, script.filename)
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"Vendor script {path} not found. Run 'python HtmlBundler.py --fetch' "
+            f"on a connected machine, or copy {script.url} there."
+        )
+    return path
+
+
+def inline_vendor_scripts(template: str, vendor_dir: str) -> str:
+    """Replace CDN script tags with the local vendor scripts the template uses"""
+    def render(script):
+        with open(vendor_script_path(vendor_dir, script), 'r', encoding='utf-8') as f:
+            source = f.read().replace('</script', '<\\/script')
+        return f'<script id="vendor-{script.name}">{source}</script>\n'
+
+    return rewrite_vendor_scripts(template, render)
+
+
+def split_template(template: str) -> CompiledTemplate:
+    """Split a template around its classData placeholder"""
+    split_point = template.find(DATA_START_MARKER)
+    if split_point == -1:
+        raise ValueError("Could not find insertion point in template")
+
+    end_point = template.find(DATA_END_MARKER, split_point)
+    if end_point == -1:
+        raise ValueError("Could not find end point in template")
+
+    return CompiledTemplate(template[:split_point], template[end_point:])
+
+
+@lru_cache(maxsize=16)
+def _compile_template(template_path: str, mtime: float, vendor_dir: Optional[str], minify: bool) -> CompiledTemplate:
+    with open(template_path, 'r', encoding='utf-8') as f:
+        template = f.read()
+
+    if minify:
+        template = minify_html(template)
+    if vendor_dir:
+        template = inline_vendor_scripts(template, vendor_dir)
+    return split_template(template)
+
+
+def compile_template(template_path: str, vendor_dir: Optional[str] = None, minify: bool = False) -> CompiledTemplate:
+    """Load a template, optionally minified and with its vendor scripts inlined.
+
+    Compiled templates are cached per path and modification time, so every
+    output of a batch run shares one bundle.
+    """
+    return _compile_template(os.path.abspath(template_path), os.path.getmtime(template_path),
+                             vendor_dir and os.path.abspath(vendor_dir), minify)
+
+
+def fetch_vendor_scripts(vendor_dir: str):
+    """Download every known vendor script into vendor_dir"""
+    os.makedirs(vendor_dir, exist_ok=True)
+    for script in VENDOR_SCRIPTS:
+        path = os.path.join(vendor_dir, script.filename)
+        print(f"Fetching {script.url}")
+        with urllib.request.urlopen(script.url) as response, open(path, 'wb') as f:
+            f.write(response.read())
+        print(f"Saved {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the vendor scripts inlined into offline HTML bundles')
+    parser.add_argument('--fetch', action='store_true', help='Download the vendor scripts from the CDN')
+    parser.add_argument('--vendor-dir', default=DEFAULT_VENDOR_DIR,
+                        help='Directory holding the vendor scripts (default: vendor/)')
+
+    args = parser.parse_args()
+
+    if args.fetch:
+        fetch_vendor_scripts(args.vendor_dir)
+    for script in VENDOR_SCRIPTS:
+        present = os.path.exists(os.path.join(args.vendor_dir, script.filename))
+        print(f"{script.filename:<24} {'present' if present else 'missing'}")
+
+
+if __name__ == "__main__":
+    main()
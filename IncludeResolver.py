@@ -0,0 +1,53 @@
+import os
+import re
+from typing import List, Optional, Tuple
+
+INCLUDE_PATTERN = re.compile(r'^[ \t]*!include(?:_once|_many|sub|url)?[ \t]+(.+?)[ \t]*$', re.M)
+URL_PATTERN = re.compile(r'^[a-z]+://', re.I)
+
+
+def include_target(argument: str, including_file: str) -> Optional[str]:
+    """Local file named by an !include argument, or None for URLs and the standard library"""
+    if argument.startswith('<') or URL_PATTERN.match(argument):
+        return None
+    # 'file.puml!2' and 'file.puml!ID' select a diagram inside the file; the whole file is used
+    path = argument.split('!', 1)[0]
+    return os.path.normpath(os.path.join(os.path.dirname(including_file), path))
+
+
+def read_with_includes(path: str, encoding: str = 'utf-8') -> Tuple[str, List[str]]:
+    """Read a PlantUML file with its local !include files inlined.
+
+    Returns the text and every file it depends on, the input first. Each
+    file is inlined at most once, which also breaks include cycles; missing
+    includes are reported, left out and still listed as dependencies.
+    """
+    files = [os.path.normpath(path)]
+    return _read_expanded(files[0], encoding, files), files
+
+
+def read_puml(path: str, resolve_includes: bool = False, encoding: str = 'utf-8') -> str:
+    """Read a PlantUML file as is, or with its !include files inlined"""
+    if resolve_includes:
+        return read_with_includes(path, encoding)[0]
+    with open(path, 'r', encoding=encoding) as f:
+        return f.read()
+
+
+def _read_expanded(path: str, encoding: str, files: List[str]) -> str:
+    with open(path, 'r', encoding=encoding) as f:
+        text = f.read()
+    if '!include' not in text:
+        return text
+
+    def replace(match):
+        target = include_target(match.group(1), path)
+        if target is None or target in files:
+            return ''
+        files.append(target)
+        if not os.path.exists(target):
+            print(f"Warning: included file {target} not found (from {path})")
+            return ''
+        return _read_expanded(target, encoding, files).rstrip('\n')
+
+    return INCLUDE_PATTERN.sub(replace, text)
@@ -1,12 +1,22 @@
 import json
-import re
+import os
 from typing import Dict, List, Any
 from collections import defaultdict
 
+from ColumnarPayload import COLUMNAR_DECODER, encode_columnar
+from HtmlBundler import compile_template
+from LazyMembers import MEMBER_CHUNK_CALLBACK, member_chunk_outputs
+from LineSource import as_line_source
+from MemberParser import member_text, parse_member_line
+from RelationshipScanner import MAX_LINE_LENGTH, scan_relationship, within_line_budget
+from StableHash import stable_bucket
+
 class InteractiveDiagramConverter:
-    def __init__(self):
+    def __init__(self, aggregate_edges: bool = True):
+        self.aggregate_edges = aggregate_edges
         self.classes: Dict[str, Dict[str, Any]] = {}
-        self.relationships: List[Dict[str, str]] = []
+        self.relationships: List[Dict[str, Any]] = []
+        self.relationship_index: Dict[tuple, Dict[str, Any]] = {}
         self.package_hierarchy = defaultdict(set)
         
     def parse_class_definition(self, line: str) -> tuple:
@@ -65,7 +75,7 @@ class InteractiveDiagramConverter:
         color_palette = self.get_color_palette().get(depth, self.get_color_palette()['default'])
         
         # Choose color based on a consistent hash of the full package name
-        color_index = hash(class_name) % len(color_palette)
+        color_index = stable_bucket(class_name, len(color_palette))
         
         return color_palette[color_index]
 
@@ -123,67 +133,66 @@ class InteractiveDiagramConverter:
 
     def parse_method(self, line: str) -> Dict[str, str]:
         """Parse method definition"""
-        visibility = '+'
-        match = re.match(r'([+\-#~])?(\w+)\s*\((.*?)\)', line.strip())
-        if match:
-            visibility = match.group(1) or '+'
-            name = match.group(2)
-            params = match.group(3)
+        member = parse_member_line(line)
+        if member.is_method and member.name:
             return {
-                'name': name,
-                'visibility': visibility,
-                'params': f'({params})'
+                'name': member.name,
+                'visibility': member.visibility or '+',
+                'params': f'({member.params})'
             }
         return None
 
     def parse_attribute(self, line: str) -> Dict[str, str]:
         """Parse attribute definition"""
-        visibility = '+'
-        match = re.match(r'([+\-#~])?\s*(\w+)', line.strip())
-        if match:
-            visibility = match.group(1) or '+'
-            name = match.group(2)
+        member = parse_member_line(line)
+        if member.name:
             return {
-                'name': name,
-                'visibility': visibility
+                'name': member.name,
+                'visibility': member.visibility or '+'
             }
         return None
 
     def parse_relationship(self, line: str) -> Dict[str, str]:
         """Parse relationship definition"""
-        patterns = {
-            r'([A-Za-z0-9._$]+)\s*(?:-+|\.+)(?:\|>|>)\s*([A-Za-z0-9._$]+)': 'inheritance',
-            r'([A-Za-z0-9._$]+)\s*-+>\s*([A-Za-z0-9._$]+)': 'association',
-            r'([A-Za-z0-9._$]+)\s*\*-+>\s*([A-Za-z0-9._$]+)': 'composition',
-            r'([A-Za-z0-9._$]+)\s*o-+>\s*([A-Za-z0-9._$]+)': 'aggregation',
-            r'([A-Za-z0-9._$]+)\s*\.\.->\s*([A-Za-z0-9._$]+)': 'dependency'
-        }
-        
-        for pattern, rel_type in patterns.items():
-            match = re.search(pattern, line)
-            if match:
-                return {
-                    'source': match.group(1),
-                    'target': match.group(2),
-                    'type': rel_type
-                }
+        relationship = scan_relationship(line)
+        if relationship:
+            return {
+                'source': relationship.source,
+                'target': relationship.target,
+                'type': relationship.kind
+            }
         return None
 
-    def convert_to_interactive(self, puml_code: str) -> dict:
-        """Convert PlantUML to interactive diagram format"""
+    def add_relationship(self, relationship: Dict[str, Any]):
+        """Record a relationship, counting repeats of the same (source, target, type) edge"""
+        key = (relationship['source'], relationship['target'], relationship['type'])
+        existing = self.relationship_index.get(key) if self.aggregate_edges else None
+        if existing:
+            existing['count'] += 1
+            return
+        relationship['count'] = 1
+        self.relationship_index[key] = relationship
+        self.relationships.append(relationship)
+
+    def convert_to_interactive(self, puml_code) -> dict:
+        """Convert PlantUML text or a LineSource to interactive diagram format"""
         self.classes.clear()
         self.relationships.clear()
+        self.relationship_index.clear()
         self.package_hierarchy.clear()
         
         current_class = None
-        lines = puml_code.splitlines()
+        lines = as_line_source(puml_code)
         
-        # First pass: collect all classes
+        # First pass: collect all classes; overlong lines are never class definitions
         for line in lines:
             line = line.strip()
+            if len(line) > MAX_LINE_LENGTH:
+                continue
             if line.startswith(('class ', 'interface ', 'enum ', 'abstract class ')):
                 class_name, class_type = self.parse_class_definition(line)
                 current_class = class_name
+                self.analyze_package_hierarchy(class_name)
                 
                 # Assign colors
                 if 'common' in class_name.lower() or 'poa.common' in class_name.lower():
@@ -229,6 +238,10 @@ class InteractiveDiagramConverter:
             if not line or line.startswith("'") or line.startswith("@"):
                 continue
                 
+            # Overlong lines are left out, without changing the current class
+            if not within_line_budget(line):
+                continue
+            
             if line.startswith(('class ', 'interface ', 'enum ', 'abstract class ')):
                 class_name, _ = self.parse_class_definition(line)
                 current_class = class_name
@@ -236,11 +249,11 @@ class InteractiveDiagramConverter:
             
             relationship = self.parse_relationship(line)
             if relationship:
-                self.relationships.append(relationship)
+                self.add_relationship(relationship)
                 continue
             
             if current_class and line not in ['{', '}']:
-                line = line.strip("{ }").strip()
+                line = member_text(line)
                 if '(' in line and ')' in line:
                     method = self.parse_method(line)
                     if method:
@@ -255,10 +268,11 @@ class InteractiveDiagramConverter:
         
         nodes = []
         edges = []
+        connected = {rel['source'] for rel in self.relationships} | {rel['target'] for rel in self.relationships}
         
         for class_name, class_data in self.classes.items():
             # Neon green for standalone nodes
-            if not any(rel['source'] == class_name or rel['target'] == class_name for rel in self.relationships):
+            if class_name not in connected:
                 class_data['backgroundColor'] = '#39FF14'  # Neon green for standalone nodes
             
             node_data = {
@@ -284,7 +298,8 @@ class InteractiveDiagramConverter:
                     'target': rel['target'],
                     'type': rel['type'],
                     'color': edge_color,
-                    'label': rel['type']
+                    'count': rel['count'],
+                    'label': rel['type'] if rel['count'] == 1 else f"{rel['type']} ({rel['count']}x)"
                 }
             })
         
@@ -293,33 +308,51 @@ class InteractiveDiagramConverter:
             'edges': edges
         }
 
-def convert_to_interactive_html(puml_code: str, template_path: str, output_path: str):
-    """Convert PlantUML to interactive HTML diagram"""
-    converter = InteractiveDiagramConverter()
+def convert_to_interactive_html(puml_code: str, template_path: str, output_path: str,
+                                aggregate_edges: bool = True, vendor_dir: str = None, minify: bool = False,
+                                payload: str = 'json', lazy_members: bool = False):
+    """Convert PlantUML to interactive HTML diagram.
+
+    With lazy_members, member details are written to chunk files next to
+    the page and loaded when a class is opened; the template must define
+    the chunk loader (see interactiveClassDiagramViewer.html).
+    """
+    converter = InteractiveDiagramConverter(aggregate_edges)
     diagram_data = converter.convert_to_interactive(puml_code)
-    
-    with open(template_path, 'r', encoding='utf-8') as f:
-        template = f.read()
-    
-    marker = "const classData = {"
-    split_point = template.find(marker)
-    if split_point == -1:
-        raise ValueError("Could not find insertion point in template")
-    
-    first_part = template[:split_point]
-    second_part = template[split_point:]
-    
-    end_marker = "cy.add(classData.nodes);"
-    end_point = second_part.find(end_marker)
-    if end_point == -1:
-        raise ValueError("Could not find end point in template")
-    
-    formatted_data = json.dumps(diagram_data, indent=8)
-    html_content = (
-        first_part +
-        f"const classData = {formatted_data};\n\n        " +
-        second_part[end_point:]
-    )
-    
+    if lazy_members:
+        diagram_data, chunk_files = member_chunk_outputs(diagram_data, output_path)
+        for chunk_path, text in chunk_files.items():
+            os.makedirs(os.path.dirname(chunk_path), exist_ok=True)
+            with open(chunk_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+    write_interactive_html(diagram_data, template_path, output_path, vendor_dir, minify, payload)
+
+def render_interactive_html(diagram_data: dict, template_path: str, vendor_dir: str = None,
+                            minify: bool = False, payload: str = 'json') -> str:
+    """Embed interactive diagram data into the HTML template and return the page.
+
+    With a vendor_dir the page is a self-contained offline bundle. The
+    'columnar' payload is decoded in the page by the template's
+    decodeClassData.
+    """
+    template = compile_template(template_path, vendor_dir, minify)
+    if 'memberChunks' in diagram_data:
+        if payload == 'columnar':
+            raise ValueError("The columnar payload does not support lazy member chunks")
+        if MEMBER_CHUNK_CALLBACK not in template.head + template.tail:
+            raise ValueError(f"Template {template_path} has no {MEMBER_CHUNK_CALLBACK} to load member chunks")
+    if payload == 'columnar':
+        if COLUMNAR_DECODER not in template.head + template.tail:
+            raise ValueError(f"Template {template_path} has no {COLUMNAR_DECODER} for the columnar payload")
+        formatted_data = f"{COLUMNAR_DECODER}({json.dumps(encode_columnar(diagram_data), separators=(',', ':'))})"
+    elif minify:
+        formatted_data = json.dumps(diagram_data, separators=(',', ':'))
+    else:
+        formatted_data = json.dumps(diagram_data, indent=8)
+    return template.render(formatted_data)
+
+def write_interactive_html(diagram_data: dict, template_path: str, output_path: str,
+                           vendor_dir: str = None, minify: bool = False, payload: str = 'json'):
+    """Embed interactive diagram data into the HTML template and write the page"""
     with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
\ No newline at end of file
+        f.write(render_interactive_html(diagram_data, template_path, vendor_dir, minify, payload))
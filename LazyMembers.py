@@ -0,0 +1,67 @@
+import json
+import os
+from collections import defaultdict
+from typing import Dict, Tuple
+
+from StableHash import stable_bucket
+
+# Node data moved out of the page into the member chunks
+DETAIL_KEYS = ('methods', 'attributes', 'description')
+# Members per chunk file the number of chunks is sized for
+MEMBERS_PER_CHUNK = 4096
+# Function the chunk files call, defined by interactiveClassDiagramViewer.html
+MEMBER_CHUNK_CALLBACK = 'registerMemberChunk'
+
+
+def template_loads_member_chunks(template_path: str) -> bool:
+    """Whether a template defines the loader that lazy member chunks call"""
+    with open(template_path, 'r', encoding='utf-8') as f:
+        return MEMBER_CHUNK_CALLBACK in f.read()
+
+
+def member_chunk_count(diagram_data: dict) -> int:
+    member_count = sum(len(node['data'].get('methods', [])) + len(node['data'].get('attributes', []))
+                       for node in diagram_data['nodes'])
+    return max(1, -(-member_count // MEMBERS_PER_CHUNK))
+
+
+def split_member_details(diagram_data: dict, chunk_path: str) -> Tuple[dict, Dict[int, dict]]:
+    """Split diagram data into a skeleton for the page and member chunks.
+
+    Skeleton nodes keep their id, label, type, colors and position plus a
+    memberChunk number; each chunk maps class ids to the details removed
+    from their nodes. Classes are assigned to chunks by a stable hash of
+    their id, so a class stays in the same chunk across runs.
+    """
+    chunk_count = member_chunk_count(diagram_data)
+    chunks = defaultdict(dict)
+    nodes = []
+    for node in diagram_data['nodes']:
+        node_data = dict(node['data'])
+        details = {key: node_data.pop(key) for key in DETAIL_KEYS if key in node_data}
+        chunk = stable_bucket(node_data['id'], chunk_count)
+        node_data['memberChunk'] = chunk
+        chunks[chunk][node_data['id']] = details
+        nodes.append({'data': node_data})
+
+    skeleton = dict(diagram_data, nodes=nodes, memberChunks={'path': chunk_path, 'count': chunk_count})
+    return skeleton, dict(chunks)
+
+
+def render_member_chunk(chunk: int, details: dict) -> str:
+    """Chunk file as a script, so it also loads from file:// pages"""
+    return f"{MEMBER_CHUNK_CALLBACK}({chunk}, {json.dumps(details, separators=(',', ':'))});\n"
+
+
+def member_chunk_outputs(diagram_data: dict, page_path: str) -> Tuple[dict, Dict[str, str]]:
+    """Skeleton data for the page at page_path and its chunk files, keyed by path.
+
+    The chunks go into a <page>_members directory next to the page.
+    """
+    chunk_dir = f"{os.path.splitext(page_path)[0]}_members"
+    skeleton, chunks = split_member_details(diagram_data, os.path.basename(chunk_dir))
+    files = {
+        os.path.join(chunk_dir, f"chunk_{chunk}.js"): render_member_chunk(chunk, details)
+        for chunk, details in sorted(chunks.items())
+    }
+    return skeleton, files
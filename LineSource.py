@@ -0,0 +1,61 @@
+import mmap
+import re
+from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional
+
+# A significant line: not blank, not a comment (') and not a directive (@)
+SIGNIFICANT_LINE_PATTERN = re.compile(rb"^[ \t]*([^'@\s][^\n]*)", re.MULTILINE)
+
+
+class LineSource(ABC):
+    """Re-iterable source of PlantUML lines shared by the converters"""
+
+    # Number of lines the source yields, None when unknown up front
+    line_count: Optional[int] = None
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[str]:
+        pass
+
+
+class TextLineSource(LineSource):
+    """Lines of an in-memory PlantUML string"""
+
+    def __init__(self, puml_code: str):
+        self.lines: List[str] = puml_code.splitlines()
+        self.line_count = len(self.lines)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.lines)
+
+
+class MappedFileLineSource(LineSource):
+    """Lines of a memory-mapped PlantUML file.
+
+    Line boundaries are found by scanning the mapped bytes. Blank, comment
+    and directive lines are skipped without being decoded, so only lines
+    that can start a class, relationship or member become Python strings.
+    Each iteration maps the file again, so the source can be read twice.
+    """
+
+    def __init__(self, path: str, encoding: str = 'utf-8'):
+        self.path = path
+        self.encoding = encoding
+
+    def __iter__(self) -> Iterator[str]:
+        with open(self.path, 'rb') as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                return
+            with mapped:
+                for match in SIGNIFICANT_LINE_PATTERN.finditer(mapped):
+                    yield match.group(1).decode(self.encoding).strip()
+
+
+def as_line_source(puml_code) -> LineSource:
+    """Wrap PlantUML text in a LineSource, passing existing sources through"""
+    if isinstance(puml_code, LineSource):
+        return puml_code
+    return TextLineSource(puml_code)
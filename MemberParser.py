@@ -0,0 +1,68 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+# Upper bound on distinct member lines remembered by the parser and formatters
+MEMBER_CACHE_SIZE = 16384
+
+# One scan over a member line such as "{static} +List<String> find(String q) : List"
+MEMBER_PATTERN = re.compile(r"""
+    \s*(?P<leading_modifiers>(?:\{\w+\}\s*)*)      # modifiers before the visibility
+    (?P<visibility>[+\-#~]?)\s*
+    (?P<trailing_modifiers>(?:\{\w+\}\s*)*)        # modifiers after the visibility
+    (?P<head>[^(:]*)                               # declared type and name
+    (?:\((?P<params>[^)]*)\))?                     # parameter list, methods only
+    [^:]*(?::\s*(?P<type>.*))?                     # trailing ": Type"
+""", re.VERBOSE)
+
+STATIC_MODIFIERS = ('{static}', '{classifier}')
+
+
+class MemberSignature(NamedTuple):
+    visibility: str            # '' when the line has no visibility marker
+    is_static: bool
+    is_abstract: bool
+    name: str
+    params: Optional[str]      # raw parameter list, None for attributes
+    leading_type: str          # type written before the name ("String getName()")
+    trailing_type: str         # type written after a colon ("getName() : String")
+
+    @property
+    def is_method(self) -> bool:
+        return self.params is not None
+
+    @property
+    def type(self) -> str:
+        return self.trailing_type or self.leading_type
+
+
+def member_text(line: str) -> str:
+    """Member part of a stripped class body line.
+
+    Only a trailing " {" is removed, so leading modifiers such as
+    "{static}" reach parse_member_line intact; lone braces give ''.
+    """
+    if line.endswith('{'):
+        line = line[:-1].rstrip()
+    return '' if line == '}' else line
+
+
+@lru_cache(maxsize=MEMBER_CACHE_SIZE)
+def parse_member_line(line: str) -> MemberSignature:
+    """Parse a class member line into its parts"""
+    match = MEMBER_PATTERN.match(line)
+    modifiers = match.group('leading_modifiers') + match.group('trailing_modifiers')
+
+    # Attribute defaults ("int count = 0") are not part of the name
+    tokens = match.group('head').split('=', 1)[0].split()
+    name = tokens[-1] if tokens else ''
+
+    return MemberSignature(
+        visibility=match.group('visibility'),
+        is_static=any(modifier in modifiers for modifier in STATIC_MODIFIERS),
+        is_abstract='{abstract}' in modifiers,
+        name=name,
+        params=match.group('params'),
+        leading_type=' '.join(tokens[:-1]),
+        trailing_type=(match.group('type') or '').strip(),
+    )
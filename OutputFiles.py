@@ -0,0 +1,26 @@
+import hashlib
+import os
+from typing import Optional
+
+
+def content_hash(text: str) -> bytes:
+    """Short digest of a text, used to tell whether generated content changed"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+def write_if_changed(path: str, text: str, previous: Optional[str] = None) -> bool:
+    """Write a file unless it already holds exactly this text.
+
+    previous is the text last written to the path, if known; otherwise the
+    file on disk is compared. Returns whether the file was written.
+    """
+    if previous is None and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            previous = f.read()
+    if previous == text:
+        return False
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return True
@@ -0,0 +1,181 @@
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+
+from InteractiveDiagramConverter import InteractiveDiagramConverter
+from StableHash import stable_bucket
+
+# Package diagrams default to the deepest level with at most this many packages
+MAX_AUTO_PACKAGES = 100
+PACKAGE_SPACING = 220
+
+
+class PackageSummary(NamedTuple):
+    packages: List[str]                             # package name by prefix ID
+    class_counts: List[int]                         # classes in each package and its subpackages, by ID
+    levels: List[List[int]]                         # package IDs shown at each depth, from depth 1
+    matrices: List[Dict[Tuple[int, int], int]]      # (source, target) IDs -> relationships, per depth
+
+    @property
+    def max_depth(self) -> int:
+        return len(self.levels)
+
+
+def summarize_packages(diagram_data: dict, package_hierarchy: Dict[str, Set[str]]) -> PackageSummary:
+    """Roll class relationships up into package-to-package counts at every depth.
+
+    Every package gets an integer prefix ID, numbered parents first from
+    package_hierarchy, and every class the IDs of its enclosing packages
+    from the top down. One pass over the edges then adds each relationship
+    to the sparse matrix of every depth. Classes in shallower packages than
+    a depth count towards their own package there; classes outside any
+    package are left out.
+    """
+    ids: Dict[str, int] = {}
+    packages: List[str] = []
+
+    def package_id(package: str) -> int:
+        if package not in ids:
+            ids[package] = len(packages)
+            packages.append(package)
+        return ids[package]
+
+    for package in sorted(package_hierarchy, key=lambda name: (name.count('.'), name)):
+        package_id(package)
+
+    prefixes: Dict[str, List[int]] = {}
+
+    def prefix_ids(class_name: str) -> List[int]:
+        found = prefixes.get(class_name)
+        if found is None:
+            found = []
+            package = None
+            for part in class_name.split('.')[:-1]:
+                package = f"{package}.{part}" if package else part
+                found.append(package_id(package))
+            prefixes[class_name] = found
+        return found
+
+    class_prefixes = [prefix_ids(node['data']['id']) for node in diagram_data['nodes']]
+    max_depth = max((len(found) for found in class_prefixes), default=0)
+    class_counts = [0] * len(packages)
+    for found in class_prefixes:
+        for package in found:
+            class_counts[package] += 1
+
+    # Prefix IDs of a class at every depth, its own package standing in below it
+    depth_ids: Dict[str, List[int]] = {}
+
+    def ids_by_depth(class_name: str) -> List[int]:
+        found = depth_ids.get(class_name)
+        if found is None:
+            found = prefix_ids(class_name)[:max_depth]
+            if found:
+                found += [found[-1]] * (max_depth - len(found))
+            depth_ids[class_name] = found
+        return found
+
+    levels: List[Set[int]] = [set() for _ in range(max_depth)]
+    for node in diagram_data['nodes']:
+        for level, package in zip(levels, ids_by_depth(node['data']['id'])):
+            level.add(package)
+
+    matrices: List[Dict[Tuple[int, int], int]] = [defaultdict(int) for _ in range(max_depth)]
+    for edge in diagram_data['edges']:
+        edge_data = edge['data']
+        source, target = ids_by_depth(edge_data['source']), ids_by_depth(edge_data['target'])
+        if not source or not target:
+            continue
+        count = edge_data.get('count', 1)
+        for matrix, key in zip(matrices, zip(source, target)):
+            matrix[key] += count
+
+    # Endpoints that are not declared classes may have added packages
+    class_counts.extend([0] * (len(packages) - len(class_counts)))
+    for level, matrix in zip(levels, matrices):
+        for source, target in matrix:
+            level.add(source)
+            level.add(target)
+    return PackageSummary(
+        packages=packages,
+        class_counts=class_counts,
+        levels=[sorted(level, key=packages.__getitem__) for level in levels],
+        matrices=[dict(matrix) for matrix in matrices],
+    )
+
+
+def default_depth(summary: PackageSummary) -> int:
+    """Deepest level with at most MAX_AUTO_PACKAGES packages, at least 1"""
+    depth = 1
+    for level_depth, level in enumerate(summary.levels, 1):
+        if len(level) <= MAX_AUTO_PACKAGES:
+            depth = level_depth
+    return depth
+
+
+def package_level(summary: PackageSummary, depth: int) -> Tuple[List[int], Dict[Tuple[int, int], int]]:
+    """Package IDs and relationship counts of one depth, clamped to the depths there are"""
+    depth = min(depth, summary.max_depth)
+    if depth < 1:
+        return [], {}
+    return summary.levels[depth - 1], summary.matrices[depth - 1]
+
+
+def package_edges(matrix: Dict[Tuple[int, int], int]) -> Iterable[Tuple[int, int, int]]:
+    """(source, target, count) of the relationships between different packages"""
+    for (source, target), count in sorted(matrix.items()):
+        if source != target:
+            yield source, target, count
+
+
+def package_to_mermaid(summary: PackageSummary, depth: int) -> str:
+    """Render one depth of the summary as a Mermaid flowchart of packages"""
+    level, matrix = package_level(summary, depth)
+    lines = ["flowchart LR"]
+    for package in level:
+        internal = matrix.get((package, package), 0)
+        lines.append(f'    p{package}["{summary.packages[package]}<br/>'
+                     f'{summary.class_counts[package]} classes, {internal} internal"]')
+    for source, target, count in package_edges(matrix):
+        lines.append(f"    p{source} -->|{count}| p{target}")
+    return '\n'.join(lines)
+
+
+def package_diagram(summary: PackageSummary, depth: int) -> dict:
+    """Interactive diagram data with one node per package at the given depth"""
+    level, matrix = package_level(summary, depth)
+    palette = InteractiveDiagramConverter().get_color_palette()
+    columns = max(1, math.ceil(math.sqrt(len(level))))
+
+    nodes = []
+    colors = {}
+    for index, package in enumerate(level):
+        name = summary.packages[package]
+        package_palette = palette.get(name.count('.') + 1, palette['default'])
+        colors[package] = package_palette[stable_bucket(name, len(package_palette))]
+        nodes.append({'data': {
+            'id': name,
+            'label': name,
+            'type': 'package',
+            'methods': [],
+            'attributes': [],
+            'description': (f"Package {name}: {summary.class_counts[package]} classes, "
+                            f"{matrix.get((package, package), 0)} internal relationships"),
+            'backgroundColor': colors[package][0],
+            'borderColor': colors[package][1],
+            'position': {'x': 100 + (index % columns) * PACKAGE_SPACING,
+                         'y': 100 + (index // columns) * PACKAGE_SPACING},
+        }})
+
+    edges = []
+    for source, target, count in package_edges(matrix):
+        edges.append({'data': {
+            'source': summary.packages[source],
+            'target': summary.packages[target],
+            'type': 'dependency',
+            'color': colors[source][0],
+            'count': count,
+            'label': str(count),
+        }})
+
+    return {'nodes': nodes, 'edges': edges}
@@ -0,0 +1,144 @@
+import re
+from typing import NamedTuple, Optional
+
+# Longest line the converters parse; longer lines are passed through unparsed.
+# Parsing is linear in the line length, so this bounds the time spent on any one line.
+MAX_LINE_LENGTH = 1 << 16
+
+IDENTIFIER_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._$')
+# Runs of these make up the body of an arrow; a run never needs re-matching, so this is linear
+ARROW_BODY_PATTERN = re.compile(r'[-.]+')
+WHITESPACE = frozenset(' \t')
+
+# Mermaid arrows for the relationship kinds found by scan_relationship, drawn
+# "source arrow target"; the diamonds of composition and aggregation sit on the
+# source, which is the whole
+MERMAID_ARROWS = {
+    'inheritance': '--|>',
+    'association': '-->',
+    'composition': '*--',
+    'aggregation': 'o--',
+    'dependency': '..>',
+}
+
+
+class Relationship(NamedTuple):
+    source: str
+    target: str
+    kind: str
+    start: int      # span of "source arrow target" in the line
+    end: int
+
+
+def arrow_kind(prefix: str, body: str, head: str) -> Optional[str]:
+    """Relationship kind of an arrow split into prefix, body and head.
+
+    "--|>" and "..|>" are inheritance, as are "<|--" and "<|.." drawn the
+    other way; "-->" and "<--" are associations, "..>" and "<.." dependencies.
+    A diamond marks the whole: "*--", "*-->" and "--*" are composition, "o--",
+    "o-->" and "--o" aggregation. Plain links ("--", ".."), arrows decorated
+    at both ends ("<-->", "*--o") and the other PlantUML ends ("#", "x", "+",
+    "(") are out of scope and give None.
+    """
+    if prefix in ('*', 'o') and head in ('', '>'):
+        end = prefix
+    elif prefix and head:
+        return None
+    else:
+        end = prefix or head
+    if end in ('|>', '<|'):
+        return 'inheritance'
+    if end == '*':
+        return 'composition'
+    if end == 'o':
+        return 'aggregation'
+    if end in ('>', '<'):
+        return 'dependency' if '.' in body else 'association'
+    return None
+
+
+def arrow_reversed(prefix: str, head: str) -> bool:
+    """Whether an arrow points from its right-hand name to its left-hand one"""
+    return prefix in ('<', '<|') or (not prefix and head in ('*', 'o'))
+
+
+def scan_relationship(line: str) -> Optional[Relationship]:
+    """Find the first "Source arrow Target" relationship in a line.
+
+    A single left-to-right pass over the runs of arrow characters; names are
+    scanned outwards from each arrow but never past the previous one, so every
+    character is visited a bounded number of times and the cost is linear in
+    the line length whatever its content.
+    """
+    length = len(line)
+    limit = 0   # identifiers are never scanned back past the previous arrow
+    for body in ARROW_BODY_PATTERN.finditer(line):
+        body_start, body_end = body.span()
+
+        after = line[body_end:body_end + 1]
+        if line.startswith('|>', body_end):
+            head = '|>'
+        elif after in ('>', '*') or (after == 'o' and (body_end + 1 == length
+                                                      or line[body_end + 1] not in IDENTIFIER_CHARS)):
+            # An "o" only marks aggregation when it is not the start of a name ("-->order")
+            head = after
+        else:
+            head = ''
+        arrow_end = body_end + len(head)
+
+        arrow_start = body_start
+        prefix = ''
+        if arrow_start > limit:
+            before = line[arrow_start - 1]
+            if before == '|' and arrow_start - 1 > limit and line[arrow_start - 2] == '<':
+                prefix = '<|'
+            # An "o" only marks aggregation when it is not the end of a name ("Foo-->")
+            elif before in '*<' or (before == 'o' and (arrow_start - 1 == limit
+                                                       or line[arrow_start - 2] not in IDENTIFIER_CHARS)):
+                prefix = before
+            arrow_start -= len(prefix)
+
+        kind = arrow_kind(prefix, body.group(), head)
+        if kind is None:
+            # Not an arrow, e.g. the dots of a qualified name
+            continue
+
+        source_end = arrow_start
+        while source_end > limit and line[source_end - 1] in WHITESPACE:
+            source_end -= 1
+        source_start = source_end
+        while source_start > limit and line[source_start - 1] in IDENTIFIER_CHARS:
+            source_start -= 1
+
+        target_start = arrow_end
+        while target_start < length and line[target_start] in WHITESPACE:
+            target_start += 1
+        target_end = target_start
+        while target_end < length and line[target_end] in IDENTIFIER_CHARS:
+            target_end += 1
+
+        limit = arrow_end
+        if source_start == source_end or target_start == target_end:
+            continue
+
+        source, target = line[source_start:source_end], line[target_start:target_end]
+        if arrow_reversed(prefix, head):
+            source, target = target, source
+        return Relationship(source, target, kind, source_start, target_end)
+    return None
+
+
+def mermaid_relationship(line: str, relationship: Relationship) -> str:
+    """The line with its relationship rewritten in Mermaid syntax, keeping any label"""
+    arrow = MERMAID_ARROWS[relationship.kind]
+    return (f"{line[:relationship.start]}{relationship.source} {arrow} {relationship.target}"
+            f"{line[relationship.end:]}")
+
+
+def within_line_budget(line: str) -> bool:
+    """Whether a line is short enough to parse; warns about lines that are not"""
+    if len(line) <= MAX_LINE_LENGTH:
+        return True
+    print(f"Warning: not parsing a line of {len(line)} characters "
+          f"(limit {MAX_LINE_LENGTH}): {line[:60]}...")
+    return False
@@ -0,0 +1,352 @@
+import argparse
+import json
+import os
+import re
+import shutil
+from typing import Dict, List, Optional
+
+from HtmlBundler import (DEFAULT_TEMPLATE_PATH, DEFAULT_VENDOR_DIR, INLINE_SCRIPT_PATTERN,
+                         SCRIPT_TAG_PATTERN, compile_template, rewrite_vendor_scripts, vendor_script_path)
+from IncludeResolver import read_puml
+from InteractiveDiagramConverter import InteractiveDiagramConverter
+from OutputFiles import content_hash, write_if_changed
+from StableHash import stable_hash
+
+# Global the per-diagram data files assign and the shared viewer script reads
+DATA_GLOBAL = 'window.diagramData'
+
+STYLE_PATTERN = re.compile(r'<style>(.*?)</style>', re.DOTALL)
+HEAD_PATTERN = re.compile(r'<head>(.*?)</head>', re.DOTALL)
+BODY_PATTERN = re.compile(r'<body>(.*?)</body>', re.DOTALL)
+SLUG_PATTERN = re.compile(r'[^a-z0-9]+')
+CAMEL_PART_PATTERN = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+
+DIAGRAM_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Interactive Class Diagram</title>
+{vendor_tags}    <link rel="stylesheet" href="assets/viewer.css?v={css_version}">
+</head>
+<body>{markup}
+    <script>
+        // Load the diagram named by ?d=..., then the shared viewer. Plain script
+        // tags rather than fetch() keep the site browsable from file://
+        function loadScript(src) {{
+            return new Promise((resolve, reject) => {{
+                const script = document.createElement('script');
+                script.src = src;
+                script.onload = resolve;
+                script.onerror = () => reject(new Error(`Could not load ${{src}}`));
+                document.body.appendChild(script);
+            }});
+        }}
+
+        const diagramId = new URLSearchParams(location.search).get('d');
+        if (!diagramId || !/^[\\w-]+$/.test(diagramId)) {{
+            document.getElementById('cy').textContent = 'No diagram selected. Start from index.html.';
+        }} else {{
+            loadScript(`data/${{diagramId}}.js`)
+                .then(() => {{
+                    document.title = window.diagramTitle;
+                    return loadScript('assets/viewer.js?v={js_version}');
+                }})
+                .catch(error => {{ document.getElementById('cy').textContent = error.message; }});
+        }}
+    </script>
+</body>
+</html>
+"""
+
+INDEX_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Class Diagrams</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 2em auto; max-width: 60em; }
+        #search { width: 100%; padding: 8px; font-size: 16px; box-sizing: border-box; }
+        li { margin: 4px 0; }
+        .package { color: #666; font-size: 13px; }
+        .meta { color: #666; }
+    </style>
+    <script src="search-index.js?v={index_version}"></script>
+</head>
+<body>
+    <h1>Class Diagrams</h1>
+    <input id="search" type="search" placeholder="Search classes, e.g. Customer or cust serv" autofocus>
+    <ul id="results"></ul>
+    <h2>Diagrams</h2>
+    <ul id="diagrams"></ul>
+
+    <script>
+        const index = window.searchIndex;
+
+        function diagramLink(diagram) {
+            const link = document.createElement('a');
+            link.href = `diagram.html?d=${encodeURIComponent(diagram.id)}`;
+            link.textContent = diagram.title;
+            return link;
+        }
+
+        // First term >= prefix; terms are sorted, so every match follows it
+        function lowerBound(terms, prefix) {
+            let low = 0, high = terms.length;
+            while (low < high) {
+                const mid = (low + high) >> 1;
+                if (terms[mid] < prefix) low = mid + 1; else high = mid;
+            }
+            return low;
+        }
+
+        function classesMatching(prefix) {
+            const found = new Set();
+            for (let i = lowerBound(index.terms, prefix);
+                 i < index.terms.length && index.terms[i].startsWith(prefix); i++) {
+                index.postings[i].forEach(classIndex => found.add(classIndex));
+            }
+            return found;
+        }
+
+        // Every word of the query has to prefix-match a term of the class
+        function search(query) {
+            let matches = null;
+            for (const word of query.toLowerCase().split(/\\s+/).filter(Boolean)) {
+                const found = classesMatching(word);
+                matches = matches ? new Set([...matches].filter(i => found.has(i))) : found;
+            }
+            return matches ? [...matches] : [];
+        }
+
+        function showResults(query) {
+            const results = document.getElementById('results');
+            results.replaceChildren();
+            const matches = search(query).map(i => index.classes[i])
+                .sort((a, b) => a[0].localeCompare(b[0]));
+            for (const [className, diagramIndexes] of matches.slice(0, {result_limit})) {
+                const item = document.createElement('li');
+                const dot = className.lastIndexOf('.');
+                item.append(className.slice(dot + 1), ' ');
+                const pkg = document.createElement('span');
+                pkg.className = 'package';
+                pkg.textContent = className.slice(0, Math.max(dot, 0));
+                item.append(pkg, ' ');
+                diagramIndexes.forEach(i => item.append(diagramLink(index.diagrams[i]), ' '));
+                results.appendChild(item);
+            }
+            if (matches.length > {result_limit}) {
+                const more = document.createElement('li');
+                more.className = 'meta';
+                more.textContent = `${matches.length - {result_limit}} more matches`;
+                results.appendChild(more);
+            }
+        }
+
+        const diagramList = document.getElementById('diagrams');
+        for (const diagram of index.diagrams) {
+            const item = document.createElement('li');
+            const meta = document.createElement('span');
+            meta.className = 'meta';
+            meta.textContent = ` ${diagram.classes} classes, ${diagram.relationships} relationships`;
+            item.append(diagramLink(diagram), meta);
+            diagramList.appendChild(item);
+        }
+
+        document.getElementById('search').addEventListener('input', event => showResults(event.target.value));
+    </script>
+</body>
+</html>
+"""
+
+# Search results shown at once on the index page
+RESULT_LIMIT = 200
+# Lists the files a build generated, so the next build removes only its own stale files
+MANIFEST_NAME = 'site-manifest.json'
+
+
+def version(text: str) -> str:
+    """Cache-busting token for a shared asset"""
+    return content_hash(text).hex()[:8]
+
+
+def diagram_id(input_file: str) -> str:
+    """Readable, collision-free id for a diagram, stable across builds"""
+    name = os.path.splitext(os.path.basename(input_file))[0]
+    slug = SLUG_PATTERN.sub('-', name.lower()).strip('-') or 'diagram'
+    return f"{slug}-{stable_hash(os.path.abspath(input_file)):08x}"
+
+
+def class_terms(class_name: str) -> set:
+    """Lowercase search terms for a class: full name, simple name and its camelCase words"""
+    simple_name = class_name.rsplit('.', 1)[-1]
+    terms = {class_name.lower(), simple_name.lower()}
+    terms.update(part.lower() for part in CAMEL_PART_PATTERN.findall(simple_name))
+    return terms
+
+
+class ViewerAssets:
+    """The template split into a shared stylesheet, script and page markup"""
+
+    def __init__(self, template_path: str, vendor_dir: Optional[str] = None):
+        self.vendor_dir = vendor_dir
+        self.vendor_files: List[str] = []
+        self.vendor_tags: List[str] = []
+
+        page = compile_template(template_path).render(DATA_GLOBAL)
+        page = rewrite_vendor_scripts(page, self._vendor_tag)
+        # Script tags the bundler does not know about are kept as they are
+        head = HEAD_PATTERN.search(page).group(1)
+        self.vendor_tags.extend(match.group(0).strip() for match in SCRIPT_TAG_PATTERN.finditer(head))
+
+        self.css = '\n'.join(STYLE_PATTERN.findall(page))
+        self.js = '\n'.join(INLINE_SCRIPT_PATTERN.findall(page))
+        self.markup = INLINE_SCRIPT_PATTERN.sub('', BODY_PATTERN.search(page).group(1)).rstrip()
+
+    def _vendor_tag(self, script) -> str:
+        if self.vendor_dir:
+            self.vendor_files.append(vendor_script_path(self.vendor_dir, script))
+            src = f"assets/vendor/{script.filename}"
+        else:
+            src = script.url
+        self.vendor_tags.append(f'<script id="vendor-{script.name}" src="{src}"></script>')
+        return ''
+
+    def write(self, output_dir: str):
+        assets_dir = os.path.join(output_dir, 'assets')
+        os.makedirs(assets_dir, exist_ok=True)
+        write_text(os.path.join(assets_dir, 'viewer.css'), self.css)
+        write_text(os.path.join(assets_dir, 'viewer.js'), self.js)
+        if self.vendor_files:
+            os.makedirs(os.path.join(assets_dir, 'vendor'), exist_ok=True)
+            for path in self.vendor_files:
+                shutil.copyfile(path, os.path.join(assets_dir, 'vendor', os.path.basename(path)))
+
+        vendor_tags = ''.join(f"    {tag}\n" for tag in self.vendor_tags)
+        write_text(os.path.join(output_dir, 'diagram.html'), DIAGRAM_PAGE.format(
+            vendor_tags=vendor_tags, markup=self.markup,
+            css_version=version(self.css), js_version=version(self.js)))
+
+
+class SearchIndex:
+    """Inverted index from class name terms to classes, and from classes to diagrams"""
+
+    def __init__(self):
+        self.diagrams: List[dict] = []
+        self.class_ids: Dict[str, int] = {}
+        self.class_diagrams: List[List[int]] = []
+        self.postings: Dict[str, List[int]] = {}
+
+    def add_diagram(self, diagram: dict, diagram_data: dict):
+        diagram_index = len(self.diagrams)
+        self.diagrams.append(diagram)
+        for node in diagram_data['nodes']:
+            class_name = node['data']['id']
+            class_index = self.class_ids.get(class_name)
+            if class_index is None:
+                class_index = self.class_ids[class_name] = len(self.class_diagrams)
+                self.class_diagrams.append([])
+                for term in class_terms(class_name):
+                    self.postings.setdefault(term, []).append(class_index)
+            self.class_diagrams[class_index].append(diagram_index)
+
+    def to_json(self) -> dict:
+        terms = sorted(self.postings)
+        return {
+            'diagrams': self.diagrams,
+            'classes': [[class_name, self.class_diagrams[i]] for class_name, i in self.class_ids.items()],
+            'terms': terms,
+            'postings': [self.postings[term] for term in terms],
+        }
+
+
+def read_manifest(path: str) -> List[str]:
+    """Data files written by the previous build into this site, none for a new site"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [name for name in json.load(f).get('dataFiles', []) if os.path.basename(name) == name]
+
+
+def write_text(path: str, text: str):
+    # Unchanged files keep their modification time, so browsers and rebuilds can skip them
+    write_if_changed(path, text)
+
+
+def build_site(input_files: List[str], output_dir: str, template_path: str = DEFAULT_TEMPLATE_PATH,
+               vendor_dir: Optional[str] = None, aggregate_edges: bool = True,
+               diagram_models: Optional[Dict[str, dict]] = None, resolve_includes: bool = False) -> str:
+    """Write a browsable site for several diagrams and return the index page path.
+
+    The viewer script, stylesheet and vendor scripts are written once under
+    assets/, each diagram only adds a small data file that diagram.html loads
+    on demand, and index.html searches class names through a prebuilt index.
+    Inputs already converted can be passed in diagram_models, keyed by path;
+    the others are read with their !include files inlined if resolve_includes.
+    """
+    data_dir = os.path.join(output_dir, 'data')
+    os.makedirs(data_dir, exist_ok=True)
+    ViewerAssets(template_path, vendor_dir).write(output_dir)
+
+    search_index = SearchIndex()
+    data_files = set()
+    for input_file in input_files:
+        diagram_data = (diagram_models or {}).get(input_file)
+        if diagram_data is None:
+            puml_content = read_puml(input_file, resolve_includes)
+            diagram_data = InteractiveDiagramConverter(aggregate_edges).convert_to_interactive(puml_content)
+
+        diagram = {
+            'id': diagram_id(input_file),
+            'title': os.path.splitext(os.path.basename(input_file))[0],
+            'classes': len(diagram_data['nodes']),
+            'relationships': len(diagram_data['edges']),
+        }
+        search_index.add_diagram(diagram, diagram_data)
+
+        data_file = f"{diagram['id']}.js"
+        data_files.add(data_file)
+        write_text(os.path.join(data_dir, data_file),
+                   f"window.diagramTitle = {json.dumps(diagram['title'])};\n"
+                   f"{DATA_GLOBAL} = {json.dumps(diagram_data, separators=(',', ':'))};\n")
+
+    # Drop data left behind by diagrams of earlier builds that are no longer part of the
+    # site; only files listed in the previous manifest are ours to remove
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    for name in set(read_manifest(manifest_path)) - data_files:
+        path = os.path.join(data_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
+    write_text(manifest_path, json.dumps({'dataFiles': sorted(data_files)}, indent=2))
+
+    index_js = f"window.searchIndex = {json.dumps(search_index.to_json(), separators=(',', ':'))};\n"
+    write_text(os.path.join(output_dir, 'search-index.js'), index_js)
+
+    index_page = os.path.join(output_dir, 'index.html')
+    write_text(index_page, INDEX_PAGE.replace('{index_version}', version(index_js))
+               .replace('{result_limit}', str(RESULT_LIMIT)))
+    return index_page
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a searchable site of interactive class diagrams')
+    parser.add_argument('input_files', nargs='+', metavar='input_file', help='Input PlantUML file path(s)')
+    parser.add_argument('--output', '-o', required=True, help='Directory to write the site to')
+    parser.add_argument('--template', help='Path to HTML template file', default=DEFAULT_TEMPLATE_PATH)
+    parser.add_argument('--vendor-dir', nargs='?', const=DEFAULT_VENDOR_DIR,
+                        help='Serve the vendor scripts from the site instead of the CDN '
+                             '(default directory: vendor/)')
+    parser.add_argument('--keep-duplicate-edges', action='store_true',
+                        help='Emit repeated relationships separately instead of one edge with a count')
+    parser.add_argument('--resolve-includes', action='store_true',
+                        help='Inline local !include files before converting')
+
+    args = parser.parse_args()
+
+    index_page = build_site(args.input_files, args.output, args.template, args.vendor_dir,
+                            aggregate_edges=not args.keep_duplicate_edges,
+                            resolve_includes=args.resolve_includes)
+    print(f"Created site: {index_page}")
+
+
+if __name__ == "__main__":
+    main()
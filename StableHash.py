@@ -0,0 +1,20 @@
+import zlib
+from functools import lru_cache
+
+# Distinct names remembered by stable_hash
+HASH_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=HASH_CACHE_SIZE)
+def stable_hash(text: str) -> int:
+    """Fast non-cryptographic hash that is identical across processes and runs.
+
+    Python's built-in hash() is salted per process, so anything derived
+    from it (colors, chunk assignment, cache keys) changes between runs.
+    """
+    return zlib.crc32(text.encode('utf-8'))
+
+
+def stable_bucket(text: str, bucket_count: int) -> int:
+    """Assign a name to one of bucket_count buckets, the same way on every run"""
+    return stable_hash(text) % bucket_count
@@ -0,0 +1,394 @@
+import argparse
+import json
+import math
+import os
+import sys
+from collections import defaultdict
+from html import escape
+from typing import Dict, List, NamedTuple, Optional
+
+from IncludeResolver import read_puml
+from InteractiveDiagramConverter import InteractiveDiagramConverter
+
+# Node box geometry, matching the interactive template's 14px bold labels and 20px padding
+FONT_SIZE = 14
+CHAR_WIDTH = 8.5
+NODE_PADDING = 20
+NODE_HEIGHT = FONT_SIZE + 2 * NODE_PADDING
+MARGIN = 50
+
+# Pixel size of one tile image, and the smallest on-screen font size still drawn in tiles
+TILE_SIZE = 1024
+MIN_LABEL_PIXELS = 4
+# Elements smaller than this on screen are left out of a level's tiles
+MIN_ELEMENT_PIXELS = 1
+# Edges spanning more tiles than this at a level are drawn only in the tiles of their ends
+MAX_EDGE_TILES = 16
+
+TILE_VIEWER = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>{title}</title>
+    <style>
+        html, body { margin: 0; height: 100%; overflow: hidden; background: #fff; }
+        #viewport { position: absolute; inset: 0; cursor: grab; }
+        #viewport img { position: absolute; image-rendering: auto; }
+    </style>
+    <script src="manifest.js"></script>
+</head>
+<body>
+    <div id="viewport"></div>
+    <script>
+        // Pan with the mouse, zoom with the wheel; only tiles of the level
+        // closest to the current zoom that intersect the viewport are loaded
+        const manifest = window.tileManifest;
+        const viewport = document.getElementById('viewport');
+        const shown = new Map();
+        let scale = Math.min(innerWidth, innerHeight) / manifest.worldSize;
+        let originX = 0, originY = 0;
+
+        function render() {
+            const level = Math.max(0, Math.min(manifest.levels.length - 1,
+                Math.round(Math.log2(scale * manifest.worldSize / manifest.tileSize))));
+            const { tileWorldSize, tiles } = manifest.levels[level];
+            const available = new Set(tiles);
+            const wanted = new Set();
+            const firstX = Math.max(0, Math.floor(-originX / scale / tileWorldSize));
+            const firstY = Math.max(0, Math.floor(-originY / scale / tileWorldSize));
+            const lastX = Math.floor((innerWidth - originX) / scale / tileWorldSize);
+            const lastY = Math.floor((innerHeight - originY) / scale / tileWorldSize);
+            for (let y = firstY; y <= lastY; y++) {
+                for (let x = firstX; x <= lastX; x++) {
+                    const key = `${x}_${y}`;
+                    if (!available.has(key)) continue;
+                    const src = `tiles/${level}/${key}.svg`;
+                    wanted.add(src);
+                    let img = shown.get(src);
+                    if (!img) {
+                        img = document.createElement('img');
+                        img.src = src;
+                        viewport.appendChild(img);
+                        shown.set(src, img);
+                    }
+                    const size = tileWorldSize * scale;
+                    img.style.left = `${originX + x * size}px`;
+                    img.style.top = `${originY + y * size}px`;
+                    img.style.width = img.style.height = `${size}px`;
+                }
+            }
+            for (const [src, img] of shown) {
+                if (!wanted.has(src)) {
+                    img.remove();
+                    shown.delete(src);
+                }
+            }
+        }
+
+        viewport.addEventListener('wheel', event => {
+            event.preventDefault();
+            const factor = Math.exp(-event.deltaY * 0.002);
+            originX = event.clientX - (event.clientX - originX) * factor;
+            originY = event.clientY - (event.clientY - originY) * factor;
+            scale *= factor;
+            render();
+        }, { passive: false });
+
+        let dragging = null;
+        viewport.addEventListener('mousedown', event => { dragging = [event.clientX, event.clientY]; });
+        addEventListener('mouseup', () => { dragging = null; });
+        addEventListener('mousemove', event => {
+            if (!dragging) return;
+            originX += event.clientX - dragging[0];
+            originY += event.clientY - dragging[1];
+            dragging = [event.clientX, event.clientY];
+            render();
+        });
+        addEventListener('resize', render);
+        render();
+    </script>
+</body>
+</html>
+"""
+
+
+class Box(NamedTuple):
+    """Node rectangle in diagram coordinates, centered on the node position"""
+    x: float
+    y: float
+    half_width: float
+    half_height: float
+
+
+class Bounds(NamedTuple):
+    min_x: float
+    min_y: float
+    max_x: float
+    max_y: float
+
+
+def node_box(node_data: dict) -> Box:
+    position = node_data.get('position') or {'x': 0, 'y': 0}
+    width = len(node_data['label']) * CHAR_WIDTH + 2 * NODE_PADDING
+    return Box(position['x'], position['y'], width / 2, NODE_HEIGHT / 2)
+
+
+def edge_width(edge_data: dict) -> float:
+    """Stroke width for an edge, as mapData(count, 1, 10, 2, 8) in the template"""
+    count = min(max(edge_data.get('count', 1), 1), 10)
+    return 2 + (count - 1) * 6 / 9
+
+
+def clip_to_box(from_x: float, from_y: float, box: Box):
+    """Point where the segment from (from_x, from_y) to the box center enters the box"""
+    dx, dy = from_x - box.x, from_y - box.y
+    if dx == 0 and dy == 0:
+        return box.x, box.y
+    t = min(box.half_width / abs(dx) if dx else math.inf, box.half_height / abs(dy) if dy else math.inf)
+    return box.x + dx * min(t, 1), box.y + dy * min(t, 1)
+
+
+class Scene:
+    """Node boxes and edge segments of a diagram, with the SVG markup of each element"""
+
+    def __init__(self, diagram_data: dict):
+        self.nodes = [node['data'] for node in diagram_data['nodes']]
+        self.boxes = [node_box(node_data) for node_data in self.nodes]
+        index = {node_data['id']: i for i, node_data in enumerate(self.nodes)}
+
+        # Edges between classes without a node cannot be placed and are skipped
+        self.edges = []
+        self.segments = []
+        for edge in diagram_data['edges']:
+            edge_data = edge['data']
+            source, target = index.get(edge_data['source']), index.get(edge_data['target'])
+            if source is None or target is None or source == target:
+                continue
+            source_box, target_box = self.boxes[source], self.boxes[target]
+            x2, y2 = clip_to_box(source_box.x, source_box.y, target_box)
+            self.edges.append(edge_data)
+            self.segments.append((source_box.x, source_box.y, x2, y2))
+
+        self.colors = sorted({edge_data['color'] for edge_data in self.edges})
+        self.marker_ids = {color: f"arrow{i}" for i, color in enumerate(self.colors)}
+        self.bounds = self._bounds()
+
+    def _bounds(self) -> Bounds:
+        if not self.boxes:
+            return Bounds(0, 0, 1, 1)
+        return Bounds(min(box.x - box.half_width for box in self.boxes) - MARGIN,
+                      min(box.y - box.half_height for box in self.boxes) - MARGIN,
+                      max(box.x + box.half_width for box in self.boxes) + MARGIN,
+                      max(box.y + box.half_height for box in self.boxes) + MARGIN)
+
+    def defs(self) -> str:
+        markers = ''.join(
+            f'<marker id="{self.marker_ids[color]}" viewBox="0 0 10 10" refX="10" refY="5" '
+            f'markerWidth="6" markerHeight="6" orient="auto-start-reverse">'
+            f'<path d="M0,0L10,5L0,10z" fill="{escape(color)}"/></marker>'
+            for color in self.colors
+        )
+        return (f'<defs>{markers}</defs>\n'
+                f'<style>text{{font:bold {FONT_SIZE}px Arial,sans-serif;text-anchor:middle;'
+                f'dominant-baseline:central}}</style>\n')
+
+    def edge_svg(self, i: int) -> str:
+        edge_data = self.edges[i]
+        x1, y1, x2, y2 = self.segments[i]
+        return (f'<line x1="{x1:g}" y1="{y1:g}" x2="{x2:g}" y2="{y2:g}" stroke="{escape(edge_data["color"])}" '
+                f'stroke-width="{edge_width(edge_data):.3g}" marker-end="url(#{self.marker_ids[edge_data["color"]]})"/>\n')
+
+    def node_svg(self, i: int, with_label: bool = True) -> str:
+        node_data = self.nodes[i]
+        box = self.boxes[i]
+        dash = ' stroke-dasharray="6 4"' if node_data.get('type') == 'interface' else ''
+        rect = (f'<rect x="{box.x - box.half_width:g}" y="{box.y - box.half_height:g}" '
+                f'width="{2 * box.half_width:g}" height="{2 * box.half_height:g}" '
+                f'fill="{escape(node_data["backgroundColor"])}" stroke="{escape(node_data["borderColor"])}" '
+                f'stroke-width="2"{dash}/>')
+        if not with_label:
+            return f'{rect}\n'
+        return (f'<g><title>{escape(node_data["id"])}</title>{rect}'
+                f'<text x="{box.x:g}" y="{box.y:g}">{escape(node_data["label"])}</text></g>\n')
+
+    def edge_bounds(self, i: int) -> Bounds:
+        x1, y1, x2, y2 = self.segments[i]
+        return Bounds(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+
+    def node_bounds(self, i: int) -> Bounds:
+        box = self.boxes[i]
+        return Bounds(box.x - box.half_width, box.y - box.half_height,
+                      box.x + box.half_width, box.y + box.half_height)
+
+
+def svg_header(view: Bounds, width: float, height: float) -> str:
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:g}" height="{height:g}" '
+            f'viewBox="{view.min_x:g} {view.min_y:g} {view.max_x - view.min_x:g} {view.max_y - view.min_y:g}">\n')
+
+
+def render_svg(diagram_data: dict, output_path: str) -> Scene:
+    """Write the whole diagram as one SVG file, element by element.
+
+    Edges are written first so nodes are drawn on top of them.
+    """
+    scene = Scene(diagram_data)
+    bounds = scene.bounds
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(svg_header(bounds, bounds.max_x - bounds.min_x, bounds.max_y - bounds.min_y))
+        f.write(scene.defs())
+        f.writelines(scene.edge_svg(i) for i in range(len(scene.edges)))
+        f.writelines(scene.node_svg(i) for i in range(len(scene.nodes)))
+        f.write('</svg>\n')
+    return scene
+
+
+def extent(bounds: Bounds) -> float:
+    return max(bounds.max_x - bounds.min_x, bounds.max_y - bounds.min_y)
+
+
+def tile_of(x: float, y: float, origin: Bounds, tile_world_size: float) -> tuple:
+    return int((x - origin.min_x) // tile_world_size), int((y - origin.min_y) // tile_world_size)
+
+
+def tile_range(bounds: Bounds, origin: Bounds, tile_world_size: float):
+    """Tile columns and rows an element's bounds overlap"""
+    first_x, first_y = tile_of(bounds.min_x, bounds.min_y, origin, tile_world_size)
+    last_x, last_y = tile_of(bounds.max_x, bounds.max_y, origin, tile_world_size)
+    for y in range(first_y, last_y + 1):
+        for x in range(first_x, last_x + 1):
+            yield x, y
+
+
+def edge_tiles(segment: tuple, bounds: Bounds, origin: Bounds, tile_world_size: float, max_edge_tiles: int):
+    """Tiles an edge is drawn in at one level.
+
+    An edge spanning more than max_edge_tiles tiles is only drawn in the
+    tiles of its two ends, where it shows as a stub leaving the node;
+    otherwise long edges would be repeated in every tile they cross.
+    """
+    first_x, first_y = tile_of(bounds.min_x, bounds.min_y, origin, tile_world_size)
+    last_x, last_y = tile_of(bounds.max_x, bounds.max_y, origin, tile_world_size)
+    if (last_x - first_x + 1) * (last_y - first_y + 1) <= max_edge_tiles:
+        return tile_range(bounds, origin, tile_world_size)
+    x1, y1, x2, y2 = segment
+    return {tile_of(x1, y1, origin, tile_world_size), tile_of(x2, y2, origin, tile_world_size)}
+
+
+def render_tiles(diagram_data: dict, output_dir: str, tile_size: int = TILE_SIZE,
+                 max_levels: Optional[int] = None, max_edge_tiles: int = MAX_EDGE_TILES,
+                 title: str = 'Class Diagram') -> dict:
+    """Write a pyramid of SVG tiles, a manifest and a viewer that loads only visible tiles.
+
+    Level 0 fits the whole diagram into one tile; every further level halves
+    the area a tile covers, down to one diagram pixel per screen pixel. Each
+    level is bucketed and written one tile at a time, so only the tile index
+    lists of a single level are held in memory. Labels too small to read at
+    a level are left out of its tiles, as are elements smaller than a
+    pixel, and edges crossing many tiles are cut down to their ends (see
+    edge_tiles).
+    """
+    scene = Scene(diagram_data)
+    bounds = scene.bounds
+    world_size = max(bounds.max_x - bounds.min_x, bounds.max_y - bounds.min_y)
+    level_count = max(1, math.ceil(math.log2(max(world_size / tile_size, 1))) + 1)
+    if max_levels is not None:
+        level_count = min(level_count, max_levels)
+
+    node_bounds = [scene.node_bounds(i) for i in range(len(scene.nodes))]
+    edge_bounds = [scene.edge_bounds(i) for i in range(len(scene.edges))]
+    defs = scene.defs()
+    # Element markup is built once and shared by every tile and level
+    edge_markup = [scene.edge_svg(i) for i in range(len(scene.edges))]
+    node_markup = [scene.node_svg(i) for i in range(len(scene.nodes))]
+    plain_node_markup = [scene.node_svg(i, with_label=False) for i in range(len(scene.nodes))]
+
+    levels = []
+    for level in range(level_count):
+        tile_world_size = world_size / (1 << level)
+        pixels_per_unit = tile_size / tile_world_size
+        nodes_markup = node_markup if FONT_SIZE * pixels_per_unit >= MIN_LABEL_PIXELS else plain_node_markup
+
+        tile_nodes: Dict[tuple, List[int]] = defaultdict(list)
+        tile_edges: Dict[tuple, List[int]] = defaultdict(list)
+        min_extent = MIN_ELEMENT_PIXELS / pixels_per_unit
+        for i, element_bounds in enumerate(node_bounds):
+            if extent(element_bounds) < min_extent:
+                continue
+            for tile in tile_range(element_bounds, bounds, tile_world_size):
+                tile_nodes[tile].append(i)
+        for i, element_bounds in enumerate(edge_bounds):
+            if extent(element_bounds) < min_extent:
+                continue
+            for tile in edge_tiles(scene.segments[i], element_bounds, bounds, tile_world_size, max_edge_tiles):
+                tile_edges[tile].append(i)
+
+        level_dir = os.path.join(output_dir, 'tiles', str(level))
+        os.makedirs(level_dir, exist_ok=True)
+        tiles = sorted(tile_nodes.keys() | tile_edges.keys(), key=lambda tile: (tile[1], tile[0]))
+        for x, y in tiles:
+            view = Bounds(bounds.min_x + x * tile_world_size, bounds.min_y + y * tile_world_size,
+                          bounds.min_x + (x + 1) * tile_world_size, bounds.min_y + (y + 1) * tile_world_size)
+            with open(os.path.join(level_dir, f"{x}_{y}.svg"), 'w', encoding='utf-8') as f:
+                f.write(svg_header(view, tile_size, tile_size))
+                f.write(defs)
+                f.writelines(edge_markup[i] for i in tile_edges.get((x, y), []))
+                f.writelines(nodes_markup[i] for i in tile_nodes.get((x, y), []))
+                f.write('</svg>\n')
+
+        levels.append({'level': level, 'tileWorldSize': tile_world_size, 'tiles': [f"{x}_{y}" for x, y in tiles]})
+
+    manifest = {
+        'tileSize': tile_size,
+        'worldSize': world_size,
+        'bounds': bounds._asdict(),
+        'levels': levels,
+    }
+    with open(os.path.join(output_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    # The viewer reads the manifest through a script tag so it also works from file://
+    with open(os.path.join(output_dir, 'manifest.js'), 'w', encoding='utf-8') as f:
+        f.write(f"window.tileManifest = {json.dumps(manifest, separators=(',', ':'))};\n")
+    with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(TILE_VIEWER.replace('{title}', escape(title)))
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render a PlantUML class diagram as static SVG')
+    parser.add_argument('input_file', help='Input PlantUML file path')
+    parser.add_argument('--output', '-o', help='SVG file to write (default: <input>.svg)')
+    parser.add_argument('--tiles', metavar='DIR', help='Also write a tile pyramid with a viewer into DIR')
+    parser.add_argument('--tile-size', type=int, default=TILE_SIZE, help=f'Tile size in pixels (default: {TILE_SIZE})')
+    parser.add_argument('--max-levels', type=int, help='Limit the number of pyramid levels')
+    parser.add_argument('--max-edge-tiles', type=int, default=MAX_EDGE_TILES,
+                        help=f'Tiles an edge may span before it is drawn only at its ends (default: {MAX_EDGE_TILES})')
+    parser.add_argument('--keep-duplicate-edges', action='store_true',
+                        help='Emit repeated relationships separately instead of one edge with a count')
+    parser.add_argument('--resolve-includes', action='store_true',
+                        help='Inline local !include files before rendering')
+
+    args = parser.parse_args()
+
+    try:
+        puml_content = read_puml(args.input_file, args.resolve_includes)
+    except OSError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    diagram_data = InteractiveDiagramConverter(
+        aggregate_edges=not args.keep_duplicate_edges
+    ).convert_to_interactive(puml_content)
+
+    output_file = args.output or f"{os.path.splitext(args.input_file)[0]}.svg"
+    render_svg(diagram_data, output_file)
+    print(f"Created SVG: {output_file}")
+
+    if args.tiles:
+        manifest = render_tiles(diagram_data, args.tiles, args.tile_size, args.max_levels,
+                                args.max_edge_tiles, title=os.path.basename(args.input_file))
+        tile_count = sum(len(level['tiles']) for level in manifest['levels'])
+        print(f"Created {tile_count} tiles in {len(manifest['levels'])} levels: {args.tiles}")
+
+
+if __name__ == "__main__":
+    main()
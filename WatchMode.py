@@ -0,0 +1,145 @@
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from IncludeResolver import read_with_includes
+from OutputFiles import content_hash, write_if_changed
+
+# Seconds between checks of the watched files
+POLL_INTERVAL = 0.25
+# Quiet period after the last change before regenerating, so a burst of saves converts once
+DEBOUNCE_SECONDS = 0.3
+
+
+class WatchedInput(NamedTuple):
+    """What is kept in memory for one input between rebuilds"""
+    content_hash: bytes
+    dependencies: List[str]
+    outputs: Dict[str, str]
+    model: Any
+
+
+def file_signature(path: str):
+    """Cheap change marker for a file; None while it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class InputWatcher:
+    """Regenerate the outputs of PlantUML inputs when they or their includes change.
+
+    convert(input_file, puml_content) returns the outputs of one input as a
+    dict of path to text, plus its parsed model. Models and outputs of
+    unchanged inputs are kept in memory, an input is only converted again
+    when its expanded content changes, and only outputs whose text changed
+    are rewritten. after_rebuild(models) runs after every rebuild that
+    changed a model, with the models of all inputs.
+    """
+
+    def __init__(self, input_files: Iterable[str], convert: Callable,
+                 after_rebuild: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 poll_interval: float = POLL_INTERVAL, debounce: float = DEBOUNCE_SECONDS):
+        self.input_files = list(input_files)
+        self.convert = convert
+        self.after_rebuild = after_rebuild
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.inputs: Dict[str, WatchedInput] = {}
+        self.signatures: Dict[str, Any] = {}
+
+    def rebuild(self, input_files: Iterable[str]) -> List[str]:
+        """Convert the given inputs where their content changed; returns the converted ones"""
+        converted = []
+        for input_file in input_files:
+            try:
+                puml_content, dependencies = read_with_includes(input_file)
+            except OSError as e:
+                # Editors that save by replacing the file can leave it missing for a moment
+                print(f"Error reading {input_file}: {e}")
+                continue
+
+            watched = self.inputs.get(input_file)
+            new_hash = content_hash(puml_content)
+            if watched and watched.content_hash == new_hash:
+                self.inputs[input_file] = watched._replace(dependencies=dependencies)
+                print(f"Unchanged: {input_file}")
+                continue
+
+            print(f"Converting: {input_file}")
+            try:
+                outputs, model = self.convert(input_file, puml_content)
+            except Exception as e:
+                print(f"Error converting {input_file}: {e}")
+                continue
+
+            previous = watched.outputs if watched else {}
+            for path, text in outputs.items():
+                if write_if_changed(path, text, previous.get(path)):
+                    print(f"Updated: {path}")
+            for path in previous.keys() - outputs.keys():
+                if os.path.exists(path):
+                    os.remove(path)
+                    print(f"Removed: {path}")
+
+            self.inputs[input_file] = WatchedInput(new_hash, dependencies, outputs, model)
+            converted.append(input_file)
+
+        self._track_dependencies()
+        if converted and self.after_rebuild:
+            self.after_rebuild({input_file: watched.model for input_file, watched in self.inputs.items()})
+        return converted
+
+    def affected_inputs(self, changed_paths: Set[str]) -> List[str]:
+        """Inputs that read any of the changed files"""
+        affected = []
+        for input_file in self.input_files:
+            watched = self.inputs.get(input_file)
+            dependencies = watched.dependencies if watched else [os.path.normpath(input_file)]
+            if changed_paths.intersection(dependencies):
+                affected.append(input_file)
+        return affected
+
+    def poll(self) -> Set[str]:
+        """Watched files whose signature changed since the last poll"""
+        changed = set()
+        for path, signature in self.signatures.items():
+            current = file_signature(path)
+            if current != signature:
+                self.signatures[path] = current
+                changed.add(path)
+        return changed
+
+    def run(self):
+        """Build every input once, then rebuild on changes until interrupted"""
+        self.rebuild(self.input_files)
+        print(f"Watching {len(self.signatures)} files for changes (Ctrl+C to stop)")
+
+        pending = set()
+        last_change = 0.0
+        try:
+            while True:
+                time.sleep(self.poll_interval)
+                changed = self.poll()
+                if changed:
+                    pending |= changed
+                    last_change = time.monotonic()
+                elif pending and time.monotonic() - last_change >= self.debounce:
+                    affected = self.affected_inputs(pending)
+                    pending.clear()
+                    if affected:
+                        self.rebuild(affected)
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+
+    def _track_dependencies(self):
+        """Watch exactly the inputs and the files they currently include"""
+        paths = {os.path.normpath(input_file) for input_file in self.input_files}
+        for watched in self.inputs.values():
+            paths.update(watched.dependencies)
+        self.signatures = {
+            path: self.signatures[path] if path in self.signatures else file_signature(path)
+            for path in paths
+        }
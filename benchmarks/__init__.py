@@ -0,0 +1,4 @@
+"""Benchmarks for the PlantUML converters.
+
+Run from the repository root with ``python -m benchmarks.run_benchmarks``.
+"""
@@ -0,0 +1,143 @@
+"""Benchmark line parsing on pathological input.
+
+Each case is a machine-generated line shape that made the old backtracking
+relationship patterns slow down quadratically: long generic signatures,
+long runs of dashes or dots, long names without an arrow. Every case is
+timed through the relationship scanner and the member parser at growing line
+lengths, up to the per-line budget, and once end to end through both
+converters. The legacy patterns are timed alongside for comparison, at the
+shorter lengths only.
+
+Usage:
+    python -m benchmarks.adversarial_benchmark [--legacy-max-length 1024] [--output results.json]
+"""
+import argparse
+import json
+import re
+import time
+
+from benchmarks.run_benchmarks import git_commit
+
+from converter import DiagramConverter
+from InteractiveDiagramConverter import InteractiveDiagramConverter
+from MemberParser import parse_member_line
+from RelationshipScanner import MAX_LINE_LENGTH, scan_relationship
+
+# The relationship patterns the converters used before the scanner
+LEGACY_PATTERNS = [
+    r'([A-Za-z0-9._$]+)\s*(?:-+|\.+)(?:\|>|>)\s*([A-Za-z0-9._$]+)',
+    r'([A-Za-z0-9._$]+)\s*-+>\s*([A-Za-z0-9._$]+)',
+    r'([A-Za-z0-9._$]+)\s*\*-+>\s*([A-Za-z0-9._$]+)',
+    r'([A-Za-z0-9._$]+)\s*o-+>\s*([A-Za-z0-9._$]+)',
+    r'([A-Za-z0-9._$]+)\s*\.\.->\s*([A-Za-z0-9._$]+)',
+    r'([A-Za-z0-9._$]+)\s*<-+\s*([A-Za-z0-9._$]+)',
+]
+
+
+def repeat_to(unit: str, length: int) -> str:
+    return (unit * (length // len(unit) + 1))[:length]
+
+
+def generic_signature(length: int) -> str:
+    """A method with deeply nested generic parameter types"""
+    depth = max(1, length // 24)
+    nested = 'Map<String, ' * depth + 'Object' + '>' * depth
+    return f"+{nested} transform({nested} input, List<{nested}> rest) : {nested}"[:length]
+
+
+# Line shapes, each a function of the line length
+CASES = {
+    'generic signature': generic_signature,
+    'dash run': lambda length: 'A ' + '-' * (length - 4) + ' B',
+    'dot run': lambda length: 'a' + '.' * (length - 1),
+    'name without arrow': lambda length: repeat_to('com.example.Name', length),
+    'dash run after name': lambda length: repeat_to('Name', length // 2) + '-' * (length - length // 2),
+    'arrows without names': lambda length: repeat_to('-->', length),
+    'alternating dashes': lambda length: repeat_to('a-', length),
+    'spaced arrows': lambda length: repeat_to('a   -   ', length),
+}
+
+
+def time_call(function, line: str, repeat: int) -> float:
+    """Best time of one call over a few runs, in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(line)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def scan_line(line: str):
+    scan_relationship(line)
+    parse_member_line.__wrapped__(line)
+
+
+def legacy_scan_line(line: str):
+    for pattern in LEGACY_PATTERNS:
+        if re.search(pattern, line):
+            break
+
+
+def run_adversarial_benchmark(lengths, legacy_max_length: int, repeat: int = 3) -> dict:
+    cases = []
+    for name, make_line in CASES.items():
+        for length in lengths:
+            line = make_line(length)
+            seconds = time_call(scan_line, line, repeat)
+            legacy_seconds = time_call(legacy_scan_line, line, 1) if length <= legacy_max_length else None
+            cases.append({
+                'case': name,
+                'length': len(line),
+                'seconds': seconds,
+                'legacySeconds': legacy_seconds,
+            })
+
+    # Every case at the budget, plus one line over it, through both converters
+    lines = ['class Worst {'] + [make_line(MAX_LINE_LENGTH) for make_line in CASES.values()]
+    lines += ['}', 'x' * (MAX_LINE_LENGTH + 1)]
+    puml_code = '\n'.join(lines)
+    start = time.perf_counter()
+    DiagramConverter().emit_class_events(DiagramConverter().parse_class_lines(puml_code.splitlines()))
+    InteractiveDiagramConverter().convert_to_interactive(puml_code)
+    convert_seconds = time.perf_counter() - start
+
+    worst = max(cases, key=lambda case: case['seconds'] / case['length'])
+    return {
+        'commit': git_commit(),
+        'maxLineLength': MAX_LINE_LENGTH,
+        'cases': cases,
+        'worstCase': worst['case'],
+        'worstCharsPerSecond': worst['length'] / worst['seconds'],
+        'convertBytes': len(puml_code),
+        'convertSeconds': convert_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark line parsing on pathological input')
+    parser.add_argument('--legacy-max-length', type=int, default=1024,
+                        help='Longest line timed with the legacy patterns (default: 1024)')
+    parser.add_argument('--output', '-o', help='Write the results to this JSON file')
+
+    args = parser.parse_args()
+
+    lengths = [256, 1024, 4096, 16384, MAX_LINE_LENGTH]
+    result = run_adversarial_benchmark(lengths, args.legacy_max_length)
+
+    print(f"{'case':<22} {'length':>7} {'scanner ms':>11} {'legacy ms':>11}")
+    for case in result['cases']:
+        legacy = f"{case['legacySeconds'] * 1000:11.2f}" if case['legacySeconds'] is not None else f"{'-':>11}"
+        print(f"{case['case']:<22} {case['length']:7d} {case['seconds'] * 1000:11.2f} {legacy}")
+    print(f"Worst case: {result['worstCase']} at {result['worstCharsPerSecond'] / 1e6:.1f}M chars/s")
+    print(f"Both converters on {result['convertBytes'] / 1e6:.2f} MB of worst-case lines: "
+          f"{result['convertSeconds']:.2f}s")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Headless benchmark of PNG/PDF export in the interactive HTML template.
+
+Generates a synthetic model, renders it with the template and opens the page
+in headless Chrome with ``#export-benchmark``. The page runs the exports,
+records total time and main-thread long tasks for each, and writes them into
+the DOM, which Chrome dumps back to this script.
+
+Usage:
+    python -m benchmarks.export_benchmark --classes 2000 [--chrome /path/to/chrome]
+"""
+import argparse
+import html
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Optional
+
+from benchmarks.generators import generate_class_model
+from benchmarks.run_benchmarks import TEMPLATE_PATH, git_commit
+
+import InteractiveDiagramConverter
+
+CHROME_NAMES = ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome']
+
+RESULTS_PATTERN = re.compile(r'<pre id="export-benchmark-results">(.*?)</pre>', re.DOTALL)
+
+
+def find_chrome() -> Optional[str]:
+    """Locate a Chrome or Chromium binary on the PATH, None when there is none"""
+    for name in CHROME_NAMES:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def run_export_benchmark(chrome: str, class_count: int, template_path: str, budget_ms: int) -> dict:
+    """Render a synthetic diagram and collect the page's export timings"""
+    puml_code = generate_class_model(class_count=class_count)
+    with tempfile.TemporaryDirectory() as workdir:
+        page = os.path.join(workdir, 'export_benchmark.html')
+        InteractiveDiagramConverter.convert_to_interactive_html(puml_code, template_path, page)
+        dom = subprocess.run(
+            [chrome, '--headless=new', '--disable-gpu', '--no-sandbox',
+             f'--virtual-time-budget={budget_ms}', '--dump-dom',
+             f'file://{page}#export-benchmark'],
+            capture_output=True, text=True, check=True
+        ).stdout
+
+    match = RESULTS_PATTERN.search(dom)
+    if not match:
+        raise RuntimeError('The page did not report export results; try a larger --budget')
+    return json.loads(html.unescape(match.group(1)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark PNG/PDF export of the interactive template')
+    parser.add_argument('--classes', type=int, default=2000, help='Classes in the synthetic model (default: 2000)')
+    parser.add_argument('--template', default=TEMPLATE_PATH, help='HTML template to benchmark')
+    parser.add_argument('--chrome', default=os.environ.get('CHROME'), help='Chrome/Chromium binary')
+    parser.add_argument('--budget', type=int, default=120000,
+                        help='Virtual time budget for the page in milliseconds (default: 120000)')
+    parser.add_argument('--output', '-o', help='Write the results to this JSON file')
+
+    args = parser.parse_args()
+
+    chrome = args.chrome or find_chrome()
+    if not chrome:
+        print("Error: Chrome/Chromium not found; pass --chrome or set CHROME")
+        sys.exit(1)
+
+    results = run_export_benchmark(chrome, args.classes, args.template, args.budget)
+    results['commit'] = git_commit()
+
+    for timing in results['timings']:
+        blocked = timing['mainThreadBlockedMs']
+        print(f"{timing['kind']:<4} {timing['totalMs']:10.1f} ms total  "
+              f"{'n/a' if blocked is None else f'{blocked:.1f} ms'} main thread blocked  "
+              f"{timing['bytes'] / 1e6:8.2f} MB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
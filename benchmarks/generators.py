@@ -0,0 +1,71 @@
+"""Synthetic PlantUML class model generators used by the benchmarks"""
+import random
+from typing import List
+
+CLASS_KINDS = ['class', 'class', 'class', 'interface', 'enum']
+
+# Arrow styles understood by both converters
+RELATIONSHIP_ARROWS = ['-->', '--|>', '..>', '*-->']
+
+ATTRIBUTE_TYPES = ['String', 'Long', 'int', 'boolean', 'List<String>', 'Map<String, Object>']
+
+
+def generate_package_names(package_depth: int, packages_per_level: int = 3) -> List[str]:
+    """Generate every leaf package name for the given depth and fan-out"""
+    packages = ['com.example']
+    for depth in range(package_depth):
+        packages = [f'{package}.pkg{depth}_{index}'
+                    for package in packages
+                    for index in range(packages_per_level)]
+    return packages
+
+
+def generate_members(rng: random.Random, members_per_class: int) -> List[str]:
+    """Generate attribute and method lines for a single class"""
+    members = []
+    for index in range(members_per_class):
+        if index % 2 == 0:
+            attr_type = rng.choice(ATTRIBUTE_TYPES)
+            members.append(f'    -{attr_type} field{index}')
+        else:
+            field = f'Field{index - 1}'
+            members.append(rng.choice([
+                f'    +get{field}() : String',
+                f'    +set{field}(String value) : void',
+                '    +toString() : String',
+                '    +equals(Object other) : boolean',
+                '    +getId() : Long',
+                '    {static} +builder(String name, int size, boolean flag) : Builder',
+            ]))
+    return members
+
+
+def generate_class_model(class_count: int = 1000,
+                         package_depth: int = 3,
+                         members_per_class: int = 6,
+                         edge_density: float = 1.5,
+                         packages_per_level: int = 3,
+                         seed: int = 42) -> str:
+    """Generate a synthetic PlantUML class model.
+
+    ``edge_density`` is the average number of relationships per class.
+    The same arguments always produce the same model.
+    """
+    rng = random.Random(seed)
+    packages = generate_package_names(package_depth, packages_per_level)
+
+    class_names = [f'{packages[index % len(packages)]}.Class{index}' for index in range(class_count)]
+
+    lines = ['@startuml', "' synthetic benchmark model"]
+    for class_name in class_names:
+        lines.append(f'{rng.choice(CLASS_KINDS)} {class_name}')
+        lines.extend(generate_members(rng, members_per_class))
+
+    edge_count = int(class_count * edge_density)
+    for _ in range(edge_count):
+        source = rng.choice(class_names)
+        target = rng.choice(class_names)
+        lines.append(f'{source} {rng.choice(RELATIONSHIP_ARROWS)} {target}')
+
+    lines.append('@enduml')
+    return '\n'.join(lines) + '\n'
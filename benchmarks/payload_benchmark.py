@@ -0,0 +1,130 @@
+"""Compare the JSON and columnar payloads of the interactive viewer.
+
+For each model size, reports the embedded payload size (raw and gzipped)
+and, when Node.js is available, the time to parse it and rebuild the
+Cytoscape elements with the decoder taken from the template. JSON.parse
+stands in for the browser parsing the inline object literal.
+
+Usage:
+    python -m benchmarks.payload_benchmark --sizes 1000 10000 50000 [--output results.json]
+"""
+import argparse
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+from benchmarks.generators import generate_class_model
+from benchmarks.run_benchmarks import TEMPLATE_PATH, git_commit
+
+from ColumnarPayload import COLUMNAR_DECODER, decode_columnar, encode_columnar
+from InteractiveDiagramConverter import InteractiveDiagramConverter
+
+# Template functions the columnar decoder needs
+DECODER_FUNCTIONS = ['defineLazyMembers', 'applyExtras', COLUMNAR_DECODER]
+
+DECODE_SCRIPT = """
+const fs = require('fs');
+const [payloadFile, decode, repeat] = process.argv.slice(2);
+const text = fs.readFileSync(payloadFile, 'utf8');
+const times = [];
+for (let i = 0; i < Number(repeat); i++) {
+    const start = process.hrtime.bigint();
+    const payload = JSON.parse(text);
+    const data = decode === 'columnar' ? decodeClassData(payload) : payload;
+    if (data.nodes.length < 0) throw new Error('unreachable');
+    times.push(Number(process.hrtime.bigint() - start) / 1e6);
+}
+times.sort((a, b) => a - b);
+console.log(JSON.stringify({ medianMs: times[times.length >> 1] }));
+"""
+
+
+def extract_function(source: str, name: str) -> str:
+    """Cut a top-level function declaration out of the template's script"""
+    start = source.index(f'function {name}(')
+    depth = 0
+    for index in range(source.index('{', start), len(source)):
+        if source[index] == '{':
+            depth += 1
+        elif source[index] == '}':
+            depth -= 1
+            if depth == 0:
+                return source[start:index + 1]
+    raise ValueError(f"Unbalanced braces in {name}")
+
+
+def payload_sizes(text: str) -> dict:
+    raw = text.encode('utf-8')
+    return {'bytes': len(raw), 'gzipBytes': len(gzip.compress(raw))}
+
+
+def time_decode(node: str, script: str, payload_file: str, decode: str, repeat: int) -> float:
+    output = subprocess.run([node, script, payload_file, decode, str(repeat)],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)['medianMs']
+
+
+def run_payload_benchmark(sizes, repeat: int, node: str = None) -> list:
+    with open(TEMPLATE_PATH, 'r', encoding='utf-8') as f:
+        template = f.read()
+    decoder = '\n\n'.join(extract_function(template, name) for name in DECODER_FUNCTIONS)
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        script = os.path.join(workdir, 'decode.js')
+        with open(script, 'w', encoding='utf-8') as f:
+            f.write(decoder + DECODE_SCRIPT)
+
+        for size in sizes:
+            diagram_data = InteractiveDiagramConverter().convert_to_interactive(
+                generate_class_model(class_count=size))
+            columnar = encode_columnar(diagram_data)
+            if decode_columnar(columnar) != diagram_data:
+                raise AssertionError(f"Columnar payload does not round-trip at {size} classes")
+
+            payloads = {
+                'json_indented': (json.dumps(diagram_data, indent=8), 'json'),
+                'json_compact': (json.dumps(diagram_data, separators=(',', ':')), 'json'),
+                'columnar': (json.dumps(columnar, separators=(',', ':')), 'columnar'),
+            }
+            for name, (text, decode) in payloads.items():
+                result = {'classes': size, 'payload': name, **payload_sizes(text), 'decodeMs': None}
+                if node:
+                    payload_file = os.path.join(workdir, f'{name}.json')
+                    with open(payload_file, 'w', encoding='utf-8') as f:
+                        f.write(text)
+                    result['decodeMs'] = time_decode(node, script, payload_file, decode, repeat)
+                results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare payload size and decode time of the interactive viewer')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000],
+                        help='Class counts of the synthetic models (default: 1000 10000 50000)')
+    parser.add_argument('--repeat', type=int, default=5, help='Decode runs per payload (default: 5)')
+    parser.add_argument('--node', default=shutil.which('node'), help='Node.js binary used to time decoding')
+    parser.add_argument('--output', '-o', help='Write the results to this JSON file')
+
+    args = parser.parse_args()
+
+    if not args.node:
+        print("Note: Node.js not found, reporting sizes only")
+
+    results = run_payload_benchmark(args.sizes, args.repeat, args.node)
+    for result in results:
+        decode = 'n/a' if result['decodeMs'] is None else f"{result['decodeMs']:.1f} ms"
+        print(f"{result['classes']:>7} {result['payload']:<14} {result['bytes'] / 1e6:8.2f} MB  "
+              f"{result['gzipBytes'] / 1e6:8.2f} MB gzip  {decode:>10} decode")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'commit': git_commit(), 'results': results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
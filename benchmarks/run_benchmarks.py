@@ -0,0 +1,207 @@
+"""Run the converter benchmarks over synthetic models and record the results.
+
+Usage:
+    python -m benchmarks.run_benchmarks [--sizes 100 1000 5000] [--output results.json]
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks.generators import generate_class_model
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE_PATH = os.path.join(REPO_ROOT, 'template.html')
+RESULTS_DIR = os.path.join(REPO_ROOT, 'benchmarks', 'results')
+
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import InteractiveDiagramConverter  # noqa: E402
+from converter import DiagramConverter  # noqa: E402
+
+
+def bench_class_diagram(puml_code: str, workdir: str) -> int:
+    """Convert to Mermaid and return the output size in bytes"""
+    diagrams = DiagramConverter().convert_class_diagram(puml_code)
+    return sum(len(diagram.encode('utf-8')) for diagram in diagrams)
+
+
+def bench_class_diagram_sharded(puml_code: str, workdir: str) -> int:
+    """Convert to Mermaid with one parsing process per CPU"""
+    diagrams = DiagramConverter().convert_class_diagram_sharded(puml_code)
+    return sum(len(diagram.encode('utf-8')) for diagram in diagrams)
+
+
+def bench_interactive(puml_code: str, workdir: str) -> int:
+    """Convert to Cytoscape data and return the serialized size in bytes"""
+    data = InteractiveDiagramConverter.InteractiveDiagramConverter().convert_to_interactive(puml_code)
+    return len(json.dumps(data).encode('utf-8'))
+
+
+def bench_interactive_html(puml_code: str, workdir: str) -> int:
+    """Convert to an interactive HTML page and return the file size in bytes"""
+    output_path = os.path.join(workdir, 'benchmark_interactive.html')
+    InteractiveDiagramConverter.convert_to_interactive_html(puml_code, TEMPLATE_PATH, output_path)
+    return os.path.getsize(output_path)
+
+
+def bench_interactive_html_lazy(puml_code: str, workdir: str) -> int:
+    """Convert with --lazy-members and return the size of the page alone"""
+    output_path = os.path.join(workdir, 'benchmark_lazy.html')
+    InteractiveDiagramConverter.convert_to_interactive_html(puml_code, TEMPLATE_PATH, output_path, lazy_members=True)
+    return os.path.getsize(output_path)
+
+
+BENCHMARKS = {
+    'convert_class_diagram': bench_class_diagram,
+    'convert_class_diagram_sharded': bench_class_diagram_sharded,
+    'convert_to_interactive': bench_interactive,
+    'convert_to_interactive_html': bench_interactive_html,
+    'convert_to_interactive_html_lazy': bench_interactive_html_lazy,
+}
+
+
+def git_commit() -> str:
+    """Return the current commit hash, or 'unknown' outside a git checkout"""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_benchmark(name: str, puml_code: str, workdir: str, repeat: int) -> dict:
+    """Time a benchmark, then measure its peak memory in a separate traced run"""
+    bench = BENCHMARKS[name]
+    input_bytes = len(puml_code.encode('utf-8'))
+    input_lines = puml_code.count('\n')
+
+    timings = []
+    output_bytes = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output_bytes = bench(puml_code, workdir)
+        timings.append(time.perf_counter() - start)
+
+    # tracemalloc slows everything down, so it never overlaps the timed runs
+    tracemalloc.start()
+    bench(puml_code, workdir)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        'benchmark': name,
+        'input_bytes': input_bytes,
+        'input_lines': input_lines,
+        'seconds': best,
+        'seconds_all': timings,
+        'lines_per_second': input_lines / best if best else None,
+        'mb_per_second': input_bytes / best / 1e6 if best else None,
+        'peak_memory_bytes': peak_bytes,
+        'output_bytes': output_bytes,
+    }
+
+
+def run_suite(sizes, package_depth, members_per_class, edge_density, repeat, benchmarks) -> dict:
+    """Run every selected benchmark over one synthetic model per size"""
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for class_count in sizes:
+            puml_code = generate_class_model(class_count=class_count,
+                                             package_depth=package_depth,
+                                             members_per_class=members_per_class,
+                                             edge_density=edge_density)
+            for name in benchmarks:
+                print(f"Running {name} on {class_count} classes...", file=sys.stderr)
+                result = run_benchmark(name, puml_code, workdir, repeat)
+                result.update({
+                    'class_count': class_count,
+                    'package_depth': package_depth,
+                    'members_per_class': members_per_class,
+                    'edge_density': edge_density,
+                })
+                results.append(result)
+
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def compare_results(baseline_path: str, current_path: str):
+    """Print the relative change of each benchmark between two result files"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(current_path, 'r', encoding='utf-8') as f:
+        current = json.load(f)
+
+    def key(result):
+        return (result['benchmark'], result['class_count'], result['package_depth'],
+                result['members_per_class'], result['edge_density'])
+
+    baseline_by_key = {key(result): result for result in baseline['results']}
+    print(f"{baseline['commit'][:10]} -> {current['commit'][:10]}")
+    for result in current['results']:
+        old = baseline_by_key.get(key(result))
+        if not old:
+            continue
+        changes = []
+        for metric in ('seconds', 'peak_memory_bytes', 'output_bytes'):
+            if old[metric]:
+                changes.append(f"{metric} {(result[metric] - old[metric]) / old[metric]:+.1%}")
+        print(f"{result['benchmark']:<34} {result['class_count']:>7} classes  " + '  '.join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the PlantUML converters on synthetic models')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 5000],
+                        help='Class counts to generate (default: 100 1000 5000)')
+    parser.add_argument('--package-depth', type=int, default=3, help='Package nesting depth (default: 3)')
+    parser.add_argument('--members', type=int, default=6, help='Members per class (default: 6)')
+    parser.add_argument('--edge-density', type=float, default=1.5,
+                        help='Average relationships per class (default: 1.5)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per benchmark (default: 3)')
+    parser.add_argument('--benchmark', '-b', choices=list(BENCHMARKS), action='append',
+                        help='Only run the given benchmark (may be repeated)')
+    parser.add_argument('--output', '-o', help='Results file (default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help='Compare two result files instead of running')
+
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_results(*args.compare)
+        return
+
+    report = run_suite(args.sizes, args.package_depth, args.members, args.edge_density,
+                       args.repeat, args.benchmark or list(BENCHMARKS))
+
+    output_path = args.output
+    if not output_path:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output_path = os.path.join(RESULTS_DIR, f"{report['commit'][:12]}.json")
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    for result in report['results']:
+        print(f"{result['benchmark']:<34} {result['class_count']:>7} classes  "
+              f"{result['seconds']:8.3f}s  {result['lines_per_second']:>12,.0f} lines/s  "
+              f"peak {result['peak_memory_bytes'] / 1e6:8.1f} MB  out {result['output_bytes'] / 1e6:8.2f} MB")
+    print(f"Results written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
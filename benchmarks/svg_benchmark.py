@@ -0,0 +1,84 @@
+"""Benchmark the static SVG renderer on a large synthetic model.
+
+Reports the time and output size of the single-file SVG and of the tile
+pyramid. Conversion to diagram data is timed separately, since it is not
+part of rendering.
+
+Usage:
+    python -m benchmarks.svg_benchmark --classes 50000 [--max-levels 8] [--output results.json]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.generators import generate_class_model
+from benchmarks.run_benchmarks import git_commit
+
+from InteractiveDiagramConverter import InteractiveDiagramConverter
+from SvgRenderer import render_svg, render_tiles
+
+
+def directory_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+
+def run_svg_benchmark(class_count: int, max_levels: int = None) -> dict:
+    puml_code = generate_class_model(class_count=class_count)
+
+    start = time.perf_counter()
+    diagram_data = InteractiveDiagramConverter().convert_to_interactive(puml_code)
+    convert_seconds = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as workdir:
+        svg_path = os.path.join(workdir, 'benchmark.svg')
+        start = time.perf_counter()
+        render_svg(diagram_data, svg_path)
+        svg_seconds = time.perf_counter() - start
+        svg_bytes = os.path.getsize(svg_path)
+
+        tile_dir = os.path.join(workdir, 'tiles')
+        start = time.perf_counter()
+        manifest = render_tiles(diagram_data, tile_dir, max_levels=max_levels)
+        tile_seconds = time.perf_counter() - start
+        tile_bytes = directory_size(tile_dir)
+
+    return {
+        'commit': git_commit(),
+        'classes': class_count,
+        'nodes': len(diagram_data['nodes']),
+        'edges': len(diagram_data['edges']),
+        'convertSeconds': convert_seconds,
+        'svgSeconds': svg_seconds,
+        'svgBytes': svg_bytes,
+        'tileSeconds': tile_seconds,
+        'tileBytes': tile_bytes,
+        'tileLevels': len(manifest['levels']),
+        'tileCount': sum(len(level['tiles']) for level in manifest['levels']),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark static SVG rendering of a large model')
+    parser.add_argument('--classes', type=int, default=50000, help='Classes in the synthetic model (default: 50000)')
+    parser.add_argument('--max-levels', type=int, help='Limit the number of tile pyramid levels')
+    parser.add_argument('--output', '-o', help='Write the results to this JSON file')
+
+    args = parser.parse_args()
+
+    result = run_svg_benchmark(args.classes, args.max_levels)
+    print(f"{result['nodes']} nodes, {result['edges']} edges (converted in {result['convertSeconds']:.1f}s)")
+    print(f"svg   {result['svgSeconds']:8.2f}s  {result['svgBytes'] / 1e6:8.2f} MB")
+    print(f"tiles {result['tileSeconds']:8.2f}s  {result['tileBytes'] / 1e6:8.2f} MB  "
+          f"{result['tileCount']} tiles in {result['tileLevels']} levels")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
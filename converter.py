@@ -1,437 +1,77 @@
-import json
 import sys
 import os
 import argparse
 import re
+import multiprocessing
+from functools import lru_cache
 from tqdm import tqdm
-import html
 
 import InteractiveDiagramConverter
-
-
-# Add this at the top of your Python file, after the imports
-
-TEMPLATE_HTML = """<!DOCTYPE html>
-<html>
-<head>
-    <title>Interactive Class Diagram</title>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/cytoscape/3.26.0/cytoscape.min.js"></script>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/cytoscape-pdf/0.3.0/cytoscape.pdf.min.js"></script>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/jspdf/2.5.1/jspdf.umd.min.js"></script>
-     <script src="https://cdnjs.cloudflare.com/ajax/libs/vue/3.4.15/vue.global.min.js"></script>
-    <style>
-        #cy {
-            width: 100%;
-            height: 800px;
-            position: absolute;
-            top: 0px;
-            left: 0px;
-        }
-
-        .section-label {
-            position: absolute;
-            font-family: Arial, sans-serif;
-            font-size: 16px;
-            font-weight: bold;
-            padding: 8px;
-            border-radius: 4px;
-            background-color: rgba(255, 255, 255, 0.9);
-            border: 1px solid #ccc;
-        }
-
-        #field-staff-label {
-            top: 20px;
-            left: 50px;
-            color: #4a90e2;
-        }
-
-        #common-label {
-            top: 20px;
-            left: 45%;
-            color: #7ed321;
-        }
-
-        #customer-facing-label {
-            top: 20px;
-            right: 50px;
-            color: #f5a623;
-        }
-
-
-        #toolbar{
-                    position: absolute;
-            font-family: Arial, sans-serif;
-            font-size: 16px;
-            font-weight: bold;
-            padding: 8px;
-            border-radius: 4px;
-            background-color: rgba(255, 255, 255, 0.9);
-            border: 1px solid #ccc;
-            visibility: hidden;
-        }
-
-    </style>
-</head>
-<body>
-    <div>
-        <nav id="toolbar">
-            <button id="export-png">Export to PNG</button>
-            <button id="export-pdf">Export to PDF</button>
-        </nav>
-    </div>
-    <div></div>
-    <div id="field-staff-label" class="section-label">Field Staff</div>
-    <div id="common-label" class="section-label">Common Components</div>
-    <div id="customer-facing-label" class="section-label">Customer Facing</div>
-    <div id="cy"></div>
-
-    <script>
-    
-        const layoutConfig = {
-            name: 'preset',
-            padding: 50,
-            spacingFactor: 1.5,
-            animate: true,
-            animationDuration: 500,
-            fit: true
-        };
-
-        const nodeStyle = [{
-            selector: 'node',
-            style: {
-                'shape': 'rectangle',
-                'background-color': 'data(backgroundColor)',
-                'border-color': 'data(borderColor)',
-                'border-width': 2,
-                'width': 'label',
-                'height': 'label',
-                'padding': '20px',
-                'label': 'data(label)',
-                'text-valign': 'center',
-                'text-halign': 'center',
-                'font-size': '14px',
-                'font-weight': 'bold',
-                'text-wrap': 'wrap',
-                'text-max-width': 200
-            }
-        }, {
-            selector: 'edge',
-            style: {
-                'width': 2,
-                'line-color': 'data(color)',
-                'target-arrow-color': 'data(color)',
-                'target-arrow-shape': 'triangle',
-                'curve-style': 'bezier',
-                'label': 'data(label)',
-                'font-size': '12px',
-                'text-rotation': 'autorotate',
-                'text-margin-y': -10
-            }
-        }, {
-            selector: 'node[type="interface"]',
-            style: {
-                'border-style': 'dashed'
-            }
-        }];
-
-        // Initialize cytoscape
-        const cy = cytoscape({
-            container: document.getElementById('cy'),
-            elements: [],
-            style: nodeStyle,
-            layout: layoutConfig,
-            wheelSensitivity: 0.2
-        });
-
-        // Add the class data
-        const classData = {
-            // This will be populated by the Python script
-        };
-
-        // Add nodes and edges
-        cy.add(classData.nodes);
-        cy.add(classData.edges);
-
-        // Function to organize nodes into sections
-        function organizeNodesIntoSections() {
-            const fieldStaffY = 100;
-            const commonY = 100;
-            const customerFacingY = 100;
-            const verticalSpacing = 150; // 1.5rem converted to pixels
-
-            const fieldStaffNodes = cy.nodes().filter(node => 
-                node.data('label').toLowerCase().startsWith('field') || 
-                node.data('label').toLowerCase().startsWith('staff')
-            );
-            
-            const customerFacingNodes = cy.nodes().filter(node => 
-                node.data('label').toLowerCase().startsWith('customer') || 
-                node.data('label').toLowerCase().startsWith('client')
-            );
-            
-            const commonNodes = cy.nodes().filter(node => 
-                node.data('label').toLowerCase().startsWith('common') || 
-                node.data('label').toLowerCase().startsWith('shared')
-            );
-
-            // Position field staff nodes
-            fieldStaffNodes.forEach((node, index) => {
-                node.position({
-                    x: 200,
-                    y: fieldStaffY + (index * verticalSpacing)
-                });
-            });
-
-            // Position common nodes
-            commonNodes.forEach((node, index) => {
-                node.position({
-                    x: cy.width() / 2,
-                    y: commonY + (index * verticalSpacing)
-                });
-            });
-
-            // Position customer facing nodes
-            customerFacingNodes.forEach((node, index) => {
-                node.position({
-                    x: cy.width() - 200,
-                    y: customerFacingY + (index * verticalSpacing)
-                });
-            });
-        }
-
-        // Apply the organization after the graph is loaded
-        cy.ready(() => {
-            organizeNodesIntoSections();
-            cy.fit();
-            cy.center();
-        });
-
-        // Handle window resize
-        window.addEventListener('resize', () => {
-            cy.fit();
-            cy.center();
-        });
-
-
-
-        document.getElementById('export-png').addEventListener('click', () => {
-            const pngContent = cy.png();
-            const link = document.createElement('a');
-            link.href = pngContent;
-            link.download = 'diagram.png';
-            link.click();
-        });
-
-        document.getElementById('export-pdf').addEventListener('click', async () => {
-                try {
-                    // Create a canvas with the diagram
-                    const canvas = document.createElement('canvas');
-                    const ctx = canvas.getContext('2d');
-                    
-                    // Set canvas size to match diagram
-                    const { w, h } = cy.png({ scale: 2, full: true });
-                    canvas.width = w;
-                    canvas.height = h;
-                    
-                    // Create an image from the PNG
-                    const img = new Image();
-                    img.onload = () => {
-                        ctx.drawImage(img, 0, 0);
-                        
-                        // Convert to PDF
-                        const imgData = canvas.toDataURL('image/png');
-                        const pdf = new jspdf.jsPDF({
-                            orientation: 'landscape',
-                            unit: 'px',
-                            format: [w, h]
-                        });
-                        pdf.addImage(imgData, 'PNG', 0, 0, w, h);
-                        pdf.save('diagram.pdf');
-                    };
-                    img.src = cy.png({ scale: 2, full: true });
-                } catch (error) {
-                    console.error('PDF Export failed:', error);
-                    alert('Failed to export PDF. Check console for details.');
-                }
-            });
-
-    </script>
-    <script>
-
-            function saveLayout() {
-            const positions = {};
-            cy.nodes().forEach(node => {
-                positions[node.id()] = node.position();
-            });
-            localStorage.setItem('diagramLayout', JSON.stringify(positions));
-            alert('Layout saved successfully!');
-        }
-
-        function loadLayout() {
-            const savedLayout = localStorage.getItem('diagramLayout');
-            if (savedLayout) {
-                const positions = JSON.parse(savedLayout);
-                cy.nodes().forEach(node => {
-                    const pos = positions[node.id()];
-                    if (pos) {
-                        node.position(pos);
-                    }
-                });
-                cy.fit(); // Adjust view to fit the loaded layout
-                alert('Layout loaded successfully!');
-            } else {
-                alert('No saved layout found!');
-            }
-        }
-
-
-        document.getElementById('export-png').addEventListener('click', () => {
-            try {
-                const pngContent = cy.png({
-                    scale: 2,  // Higher resolution
-                    full: true  // Capture entire graph
-                });
-                const link = document.createElement('a');
-                link.href = pngContent;
-                link.download = 'diagram.png';
-                link.click();
-            } catch (error) {
-                console.error('PNG Export failed:', error);
-                alert('Failed to export PNG. Check console for details.');
-            }
-        });
-
-        document.getElementById('export-pdf').addEventListener('click', async () => {
-        try {
-            // Create a canvas with the diagram
-            const canvas = document.createElement('canvas');
-            const ctx = canvas.getContext('2d');
-            
-            // Set canvas size to match diagram
-            const { w, h } = cy.png({ scale: 2, full: true });
-            canvas.width = w;
-            canvas.height = h;
-            
-            // Create an image from the PNG
-            const img = new Image();
-            img.onload = () => {
-                ctx.drawImage(img, 0, 0);
-                
-                // Convert to PDF
-                const imgData = canvas.toDataURL('image/png');
-                const pdf = new jspdf.jsPDF({
-                    orientation: 'landscape',
-                    unit: 'px',
-                    format: [w, h]
-                });
-                pdf.addImage(imgData, 'PNG', 0, 0, w, h);
-                pdf.save('diagram.pdf');
-            };
-            img.src = cy.png({ scale: 2, full: true });
-        } catch (error) {
-            console.error('PDF Export failed:', error);
-            alert('Failed to export PDF. Check console for details.');
-        }
-    });
-
-        // Keyboard shortcut for export
-        document.addEventListener('keydown', async (event) => {
-            // Check for Ctrl+Shift+E
-            if (event.ctrlKey && event.shiftKey && event.key === 'E') {
-                event.preventDefault();  // Prevent default browser behavior
-
-                // Create a custom export dialog
-                const exportDialog = document.createElement('div');
-                exportDialog.innerHTML = `
-                    <div style="position: fixed; top: 50%; left: 50%; transform: translate(-50%, -50%); 
-                                background: white; border: 2px solid #333; padding: 20px; 
-                                box-shadow: 0 4px 6px rgba(0,0,0,0.1); z-index: 1000;">
-                        <h3>Export Diagram</h3>
-                        <button id="export-png-dialog" style="margin: 10px; padding: 10px;">PNG</button>
-                        <button id="export-pdf-dialog" style="margin: 10px; padding: 10px;">PDF</button>
-                        <button id="save-layout-dialog" style="margin: 10px; padding: 10px;">Save Layout</button>
-                        <button id="load-layout-dialog" style="margin: 10px; padding: 10px;">Load Layout</button>
-                        <button id="cancel-export" style="margin: 10px; padding: 10px;">Cancel</button>
-                    </div>
-                `;
-                document.body.appendChild(exportDialog);
-
-                // Export PNG
-                document.getElementById('export-png-dialog').addEventListener('click', () => {
-                    try {
-                        const pngContent = cy.png({
-                            scale: 2,  // Higher resolution
-                            full: true  // Capture entire graph
-                        });
-                        const link = document.createElement('a');
-                        link.href = pngContent;
-                        link.download = 'diagram.png';
-                        link.click();
-                        document.body.removeChild(exportDialog);
-                    } catch (error) {
-                        console.error('PNG Export failed:', error);
-                        alert('Failed to export PNG. Check console for details.');
-                    }
-                });
-
-                // Export PDF
-                document.getElementById('export-pdf-dialog').addEventListener('click', async () => {
-                    try {
-                        const pdfContent = await cytoscape.exporters.pdf(cy, {
-                            scale: 2,
-                            full: true
-                        });
-                        const blob = new Blob([pdfContent], { type: 'application/pdf' });
-                        const link = document.createElement('a');
-                        link.href = URL.createObjectURL(blob);
-                        link.download = 'diagram.pdf';
-                        link.click();
-                        document.body.removeChild(exportDialog);
-                    } catch (error) {
-                        console.error('PDF Export failed:', error);
-                        alert('Failed to export PDF. Check console for details.');
-                    }
-                });
-
-                  // Save Layout
-                    document.getElementById('save-layout-dialog').addEventListener('click', () => {
-                        saveLayout();
-                        document.body.removeChild(exportDialog);
-                    });
-
-                    // Load Layout
-                    document.getElementById('load-layout-dialog').addEventListener('click', () => {
-                        loadLayout();
-                        document.body.removeChild(exportDialog);
-                    });
-
-                // Cancel button
-                document.getElementById('cancel-export').addEventListener('click', () => {
-                    document.body.removeChild(exportDialog);
-                });
-            }
-            
-        });
-    </script>
-</body>
-</html>"""
-
-
-
+from DiagramArchive import ArchiveWriter, archive_root
+from HtmlBundler import DEFAULT_TEMPLATE_PATH, DEFAULT_VENDOR_DIR
+from IncludeResolver import read_puml
+from LazyMembers import member_chunk_outputs, template_loads_member_chunks
+from LineSource import MappedFileLineSource, as_line_source
+from MemberParser import MEMBER_CACHE_SIZE, member_text, parse_member_line
+from PackageSummary import default_depth, package_diagram, package_to_mermaid, summarize_packages
+from RelationshipScanner import MAX_LINE_LENGTH, mermaid_relationship, scan_relationship, within_line_budget
+from SiteBuilder import build_site
+from WatchMode import InputWatcher
+
+
+# Events produced by DiagramConverter.parse_class_lines
+CLASS_EVENT = 'class'
+MEMBER_EVENT = 'member'
+RELATIONSHIP_EVENT = 'relationship'
+
+# Shards are only worth a process round trip above this size
+MIN_SHARD_SIZE = 1 << 20
+SHARDS_PER_JOB = 4
+CLASS_LINE_PATTERN = re.compile(r'^[ \t]*(?:class|interface|enum|abstract class) ', re.MULTILINE)
+
+UNSAFE_MEMBER_CHARS = re.compile(r'[<>"]')
+UNSAFE_PARAM_CHARS = re.compile(r'[^\w\s,]')
+UNSAFE_NAME_CHARS = re.compile(r'[^a-zA-Z0-9_]')
+
+
+def mermaid_visibility(member):
+    """Mermaid visibility marker for a parsed member, '$' marks static members"""
+    visibility = member.visibility or '+'
+    return visibility + '$' if member.is_static else visibility
+
+
+@lru_cache(maxsize=MEMBER_CACHE_SIZE)
+def format_method_line(method_line):
+    """Format a method line to Mermaid syntax, memoized per raw line"""
+    member = parse_member_line(method_line)
+    if not member.is_method:
+        return UNSAFE_MEMBER_CHARS.sub('', method_line).replace('{static}', '')
+
+    # Simplify parameters and remove special characters
+    params = member.params
+    if params:
+        params = UNSAFE_PARAM_CHARS.sub('', params)
+        param_parts = params.split(',')
+        if len(param_parts) > 2:
+            params = f"{param_parts[0].strip()}..."
+        else:
+            params = ', '.join(p.strip() for p in param_parts)
+
+    name = f"{member.leading_type} {member.name}" if member.leading_type else member.name
+    return f"{mermaid_visibility(member)}{UNSAFE_MEMBER_CHARS.sub('', name)}({params})"
+
+
+@lru_cache(maxsize=MEMBER_CACHE_SIZE)
+def format_attribute_line(attr_line):
+    """Format an attribute line to Mermaid syntax, memoized per raw line"""
+    member = parse_member_line(attr_line)
+    # Only the name is kept, type information is dropped
+    return f"{mermaid_visibility(member)}{UNSAFE_NAME_CHARS.sub('', member.name)}"
 
 
 class DiagramConverter:
-    def __init__(self):
-        self.relationship_patterns = {
-            r'([A-Za-z0-9._$]+)\s*(?:-+|\.+)(?:\|>|>)\s*([A-Za-z0-9._$]+)': r'\1 --|> \2',  # Inheritance
-            r'([A-Za-z0-9._$]+)\s*(?:-+|\.+)(?:\|>|>)\s*([A-Za-z0-9._$]+)\s*:\s*(.+)': r'\1 --|> \2 : \3',  # Inheritance with label
-            r'([A-Za-z0-9._$]+)\s*-+>\s*([A-Za-z0-9._$]+)': r'\1 --> \2',  # Association
-            r'([A-Za-z0-9._$]+)\s*\*-+>\s*([A-Za-z0-9._$]+)': r'\1 --* \2',  # Composition
-            r'([A-Za-z0-9._$]+)\s*o-+>\s*([A-Za-z0-9._$]+)': r'\1 --o \2',  # Aggregation
-            r'([A-Za-z0-9._$]+)\s*\.\.->\s*([A-Za-z0-9._$]+)': r'\1 ..> \2',  # Dependency
-            r'([A-Za-z0-9._$]+)\s*<-+\s*([A-Za-z0-9._$]+)': r'\2 --> \1',  # Reverse association
-        }
-        
+    def __init__(self, aggregate_edges=True):
+        self.aggregate_edges = aggregate_edges
         self.modifiers = {
             'abstract': '<<abstract>>',
             'interface': '<<interface>>',
@@ -454,258 +94,466 @@ class DiagramConverter:
 
     def format_method_signature(self, method_line):
         """Format method signatures to Mermaid syntax"""
-        # Remove any special characters that could cause syntax errors
-        method_line = re.sub(r'[<>"]', '', method_line)
-        
-        is_static = '{static}' in method_line
-        method_line = method_line.replace('{static}', '')
-        
-        match = re.match(r'([+\-#~]?\s*)(.*?)\s*\((.*?)\)', method_line)
-        if not match:
-            return method_line
-        
-        visibility, name, params = match.groups()
-        visibility = visibility.strip() if visibility else '+'
-        if not visibility in ['+', '-', '#', '~']:
-            visibility = '+'
-            
-        if is_static:
-            visibility = visibility + '$'
-        
-        # Simplify parameters and remove special characters
-        if params:
-            params = re.sub(r'[^\w\s,]', '', params)
-            param_parts = params.split(',')
-            if len(param_parts) > 2:
-                params = f"{param_parts[0].strip()}..."
-            else:
-                params = ', '.join(p.strip() for p in param_parts)
-        
-        return f"{visibility}{name}({params})"
+        return format_method_line(method_line)
 
     def format_attribute(self, attr_line):
         """Format class attributes to Mermaid syntax"""
-        # Remove any special characters that could cause syntax errors
-        attr_line = re.sub(r'[<>"]', '', attr_line)
-        
-        is_static = '{static}' in attr_line
-        attr_line = re.sub(r'\{(?!static\})[^}]*\}', '', attr_line)
-        attr_line = attr_line.replace('{static}', '').strip()
-        
-        match = re.match(r'([+\-#~]?\s*)(.*)', attr_line)
-        if not match:
-            return attr_line
-        
-        visibility, name = match.groups()
-        visibility = visibility.strip() if visibility else '+'
-        if not visibility in ['+', '-', '#', '~']:
-            visibility = '+'
-            
-        if is_static:
-            visibility = visibility + '$'
-            
-        # Clean up the name and remove type information
-        name = name.strip().split()[-1]
-        name = re.sub(r'[^a-zA-Z0-9_]', '', name)
-        
-        return f"{visibility}{name}"
+        return format_attribute_line(attr_line)
 
     def start_new_diagram(self, diagram_num):
         """Start a new diagram with proper syntax"""
-        return [
+        return DiagramPart([
             "classDiagram",
             "    direction TB"  # Changed to top-to-bottom for better readability
-        ]
+        ])
 
     def convert_class_diagram(self, puml_code):
-        lines = puml_code.splitlines()
-        total_lines = len(lines)
+        lines = as_line_source(puml_code)
+        
+        with tqdm(total=lines.line_count, desc="Converting diagram") as pbar:
+            return self.emit_class_events(self.parse_class_lines(lines, pbar))
+
+    def convert_class_diagram_sharded(self, puml_code, jobs=None):
+        """Convert a large class diagram using several worker processes.
+
+        The input is split into line-aligned shards and each shard is parsed
+        in its own process. The parsed events are then emitted in
+        input order, so the result is identical to convert_class_diagram.
+        Only parsing runs in parallel; emitting the diagrams stays serial.
+        jobs of 0 or None means one process per CPU.
+        """
+        if jobs is not None and jobs < 0:
+            raise ValueError(f"jobs must be 0 (one per CPU) or more, not {jobs}")
+        jobs = jobs or os.cpu_count() or 1
+        shards = split_into_shards(puml_code, jobs * SHARDS_PER_JOB)
+        if jobs == 1 or len(shards) == 1:
+            return self.convert_class_diagram(puml_code)
+        
+        with multiprocessing.Pool(jobs) as pool:
+            shard_events = pool.imap(parse_shard, shards)
+            with tqdm(total=len(shards), desc="Converting diagram shards") as pbar:
+                def events():
+                    for events_chunk in shard_events:
+                        pbar.update(1)
+                        yield from events_chunk
+                return self.emit_class_events(events())
+
+    def parse_class_definition(self, line):
+        """Parse class definition line to extract Mermaid name and type"""
+        # "class Foo {" and "class Foo{" open the class body; the brace is not the name
+        parts = line.rstrip('{').split()
+        class_type = parts[0] if parts[0] != 'abstract' else 'abstract class'
+        if len(parts) < 2:
+            return '', class_type
+        class_name = self.sanitize_class_name(parts[-1] if class_type == 'class' else parts[1])
+        return class_name, class_type
+
+    def parse_class_lines(self, lines, pbar=None, current_class=None):
+        """Parse PlantUML lines into class, member and relationship events.
+
+        Parsing only depends on the current class, so any run of lines can be
+        parsed independently once the class in effect at its start is known.
+        """
+        
+        for line in lines:
+            line = line.strip()
+            if pbar is not None:
+                pbar.update(1)
+            
+            if not line or line.startswith("'") or line.startswith("@"):
+                continue
+            
+            # Overlong lines are kept as Mermaid comments rather than parsed,
+            # without changing the current class
+            if not within_line_budget(line):
+                yield (MEMBER_EVENT, f"%% {line}")
+                continue
+            
+            # Handle class definitions
+            if line.startswith(('class ', 'interface ', 'enum ', 'abstract class ')):
+                class_name, class_type = self.parse_class_definition(line)
+                if class_name:
+                    yield (CLASS_EVENT, class_name, self.modifiers.get(class_type))
+                current_class = class_name or None
+                continue
+            
+            # Handle relationships
+            relationship = scan_relationship(line)
+            if relationship:
+                source = self.sanitize_class_name(relationship.source)
+                target = self.sanitize_class_name(relationship.target)
+                yield (RELATIONSHIP_EVENT, source, target, mermaid_relationship(line, relationship), relationship.kind)
+            
+            # Handle methods and attributes
+            elif current_class and line not in ['{', '}']:
+                line = member_text(line)
+                if line:
+                    if '(' in line and ')' in line:
+                        formatted_line = self.format_method_signature(line)
+                        yield (MEMBER_EVENT, f"{current_class} : {formatted_line}")
+                    else:
+                        formatted_line = self.format_attribute(line)
+                        if formatted_line:
+                            yield (MEMBER_EVENT, f"{current_class} : {formatted_line}")
+
+    def emit_class_events(self, events):
+        """Emit parsed events into size-limited Mermaid diagrams"""
         mermaid_diagrams = []
         current_diagram = self.start_new_diagram(self.diagram_count)
-        current_class = None
         self.defined_classes = set()
         
-        with tqdm(total=total_lines, desc="Converting diagram") as pbar:
-            i = 0
-            while i < total_lines:
-                line = lines[i].strip()
-                pbar.update(1)
-                
-                if not line or line.startswith("'") or line.startswith("@"):
-                    i += 1
-                    continue
-                
-                current_size = sum(len(l) + 1 for l in current_diagram)
-                
-                if current_size > self.MAX_DIAGRAM_SIZE:
-                    # Ensure all classes are defined before relationships
-                    current_diagram = self.organize_diagram_content(current_diagram)
-                    mermaid_diagrams.append('\n'.join(current_diagram))
-                    self.diagram_count += 1
-                    current_diagram = self.start_new_diagram(self.diagram_count)
-                    self.defined_classes = set()  # Reset defined classes for new diagram
-                
-                # Handle class definitions
-                if line.startswith(('class ', 'interface ', 'enum ', 'abstract class ')):
-                    parts = line.split()
-                    class_type = parts[0] if parts[0] != 'abstract' else 'abstract class'
-                    class_name = self.sanitize_class_name(parts[-1] if class_type == 'class' else parts[1])
-                    
-                    if class_name not in self.defined_classes:
-                        current_diagram.append(f"    class {class_name}")
-                        self.defined_classes.add(class_name)
-                        
-                        if class_type in self.modifiers:
-                            current_diagram.append(f"    {class_name} : {self.modifiers[class_type]}")
+        for event in events:
+            if current_diagram.size > self.MAX_DIAGRAM_SIZE:
+                # Ensure all classes are defined before relationships
+                mermaid_diagrams.append('\n'.join(self.organize_diagram_content(current_diagram)))
+                self.diagram_count += 1
+                current_diagram = self.start_new_diagram(self.diagram_count)
+                self.defined_classes = set()  # Reset defined classes for new diagram
+            
+            kind = event[0]
+            if kind == CLASS_EVENT:
+                _, class_name, modifier = event
+                if class_name and class_name not in self.defined_classes:
+                    current_diagram.add_definition(f"class {class_name}")
+                    self.defined_classes.add(class_name)
                     
-                    current_class = class_name
-                
-                # Handle relationships
-                elif any(re.search(pattern, line) for pattern in self.relationship_patterns):
-                    for pattern, replacement in self.relationship_patterns.items():
-                        if re.search(pattern, line):
-                            match = re.search(pattern, line)
-                            if match:
-                                source = self.sanitize_class_name(match.group(1))
-                                target = self.sanitize_class_name(match.group(2))
-                                
-                                # Ensure both classes are defined
-                                if source not in self.defined_classes:
-                                    current_diagram.append(f"    class {source}")
-                                    self.defined_classes.add(source)
-                                if target not in self.defined_classes:
-                                    current_diagram.append(f"    class {target}")
-                                    self.defined_classes.add(target)
-                                
-                                relationship = re.sub(pattern, replacement, line)
-                                current_diagram.append(f"    {relationship}")
-                            break
+                    if modifier:
+                        current_diagram.add_member(f"{class_name} : {modifier}")
+            
+            elif kind == RELATIONSHIP_EVENT:
+                _, source, target, relationship, edge_type = event
                 
-                # Handle methods and attributes
-                elif current_class and line not in ['{', '}']:
-                    line = line.strip("{ }").strip()
-                    if line:
-                        if '(' in line and ')' in line:
-                            formatted_line = self.format_method_signature(line)
-                            current_diagram.append(f"    {current_class} : {formatted_line}")
-                        else:
-                            formatted_line = self.format_attribute(line)
-                            if formatted_line:
-                                current_diagram.append(f"    {current_class} : {formatted_line}")
+                # Ensure both classes are defined, including classes that are
+                # only referenced by relationships
+                for class_name in (source, target):
+                    if class_name and class_name not in self.defined_classes:
+                        current_diagram.add_definition(f"class {class_name}")
+                        self.defined_classes.add(class_name)
                 
-                i += 1
+                edge_key = (source, target, edge_type) if self.aggregate_edges else None
+                current_diagram.add_relationship(relationship, edge_key)
+            
+            else:
+                current_diagram.add_member(event[1])
         
         # Add the last diagram
-        if len(current_diagram) > 2:  # More than just the header
-            current_diagram = self.organize_diagram_content(current_diagram)
-            mermaid_diagrams.append('\n'.join(current_diagram))
+        if current_diagram.has_content():  # More than just the header
+            mermaid_diagrams.append('\n'.join(self.organize_diagram_content(current_diagram)))
         
         return mermaid_diagrams
 
-    def organize_diagram_content(self, diagram_lines):
-        """Organize diagram content to ensure proper syntax"""
-        header = diagram_lines[:2]  # Keep the classDiagram and direction lines
-        class_definitions = []
-        class_contents = []
-        relationships = []
+    def organize_diagram_content(self, diagram):
+        """Order diagram content so all classes are defined before relationships"""
+        return diagram.header + diagram.definitions + diagram.members + diagram.render_relationships()
+
+
+class DiagramPart:
+    """Typed line buffers for one Mermaid diagram part.
+
+    The converter appends each line to the buffer matching what it just
+    emitted, so ordering the part never has to re-scan its lines.
+    """
+
+    # Emitted lines are indented by four spaces in the size budget
+    INDENT_SIZE = 4
+
+    def __init__(self, header):
+        self.header = header
+        self.definitions = []
+        self.members = []
+        self.relationships = []
+        self.relationship_counts = []
+        self.relationship_index = {}
+        self.size = sum(len(line) + 1 for line in header)
+
+    def _account(self, line):
+        self.size += len(line) + self.INDENT_SIZE + 1
+        return line.strip()
+
+    def add_definition(self, line):
+        self.definitions.append(self._account(line))
+
+    def add_member(self, line):
+        self.members.append(self._account(line))
+
+    def add_relationship(self, line, edge_key=None):
+        """Add a relationship, collapsing repeats of the same edge key into a count"""
+        if edge_key is not None:
+            index = self.relationship_index.get(edge_key)
+            if index is not None:
+                self.relationship_counts[index] += 1
+                return
+            self.relationship_index[edge_key] = len(self.relationships)
+        self.relationships.append(self._account(line))
+        self.relationship_counts.append(1)
+
+    def render_relationships(self):
+        """Relationship lines, labelled with their multiplicity when repeated"""
+        return [
+            line if count == 1 else f"{line} ({count}x)" if ' : ' in line else f"{line} : {count}x"
+            for line, count in zip(self.relationships, self.relationship_counts)
+        ]
+
+    def has_content(self):
+        return bool(self.definitions or self.members or self.relationships)
+
+def split_into_shards(puml_code, shard_count):
+    """Split PlantUML text into roughly equal shards at line boundaries.
+
+    Each shard is returned with the class definition line in effect where
+    it starts, so its member lines are attributed to the right class. Like
+    parse_class_lines, class lines over the line budget are skipped.
+    """
+    target_size = max(len(puml_code) // max(shard_count, 1), MIN_SHARD_SIZE)
+    shards = []
+    class_line = None
+    start = 0
+    while start < len(puml_code):
+        end = puml_code.find('\n', start + target_size) + 1 or len(puml_code)
+        shards.append((class_line, puml_code[start:end]))
         
-        for line in diagram_lines[2:]:
-            line = line.strip()
-            if line.startswith('class '):
-                class_definitions.append(line)
-            elif ' : ' in line and not any(rel in line for rel in ['-->', '--|>', '--*', '--o', '..>']):
-                class_contents.append(line)
-            elif any(rel in line for rel in ['-->', '--|>', '--*', '--o', '..>']):
-                relationships.append(line)
+        for match in CLASS_LINE_PATTERN.finditer(puml_code, start, end):
+            line_end = puml_code.find('\n', match.start())
+            line = puml_code[match.start():line_end if line_end != -1 else None]
+            # Overlong lines are not parsed, so they do not change the class in effect
+            if len(line.strip()) <= MAX_LINE_LENGTH:
+                class_line = line
+        start = end
+    return shards
+
+
+def parse_shard(shard):
+    """Parse one shard in a worker process into a list of events"""
+    class_line, puml_shard = shard
+    converter = DiagramConverter()
+    current_class = converter.parse_class_definition(class_line.strip())[0] if class_line else None
+    return list(converter.parse_class_lines(puml_shard.splitlines(), current_class=current_class))
+
+
+def read_input(input_file, args):
+    """Read one PlantUML input the way the command line asks for"""
+    if args.mmap and args.jobs == 1:
+        return MappedFileLineSource(input_file)
+    if args.mmap:
+        print("Note: --mmap is ignored when parsing with several jobs")
+    return read_puml(input_file, args.resolve_includes)
+
+
+def render_outputs(input_file, puml_content, args):
+    """Render the outputs selected on the command line for one input without writing them.
+
+    Returns a dict of output path to text, and the interactive diagram data
+    when it was built (for interactive output or --site), else None.
+    """
+    base_filename = os.path.splitext(input_file)[0]
+    outputs = {}
+    diagram_data = None
+    
+    if args.site or args.type in ['interactive', 'all', 'packages']:
+        # Generate interactive HTML diagram
+        interactive_converter = InteractiveDiagramConverter.InteractiveDiagramConverter(
+            aggregate_edges=not args.keep_duplicate_edges
+        )
+        diagram_data = interactive_converter.convert_to_interactive(puml_content)
+        if not args.site and args.type != 'packages':
+            output_file = f"{base_filename}_interactive.html"
+            page_data = diagram_data
+            if args.lazy_members:
+                page_data, chunk_files = member_chunk_outputs(diagram_data, output_file)
+                outputs.update(chunk_files)
+            outputs[output_file] = InteractiveDiagramConverter.render_interactive_html(
+                page_data, args.template,
+                vendor_dir=args.vendor_dir if args.bundle else None,
+                minify=args.bundle,
+                payload=args.payload
+            )
+    
+    if args.type == 'packages':
+        # Generate the package dependency summary as Mermaid and interactive HTML
+        summary = summarize_packages(diagram_data, interactive_converter.package_hierarchy)
+        depth = args.package_depth if args.package_depth is not None else default_depth(summary)
+        outputs[f"{base_filename}_packages.mmd"] = package_to_mermaid(summary, depth)
+        outputs[f"{base_filename}_packages.html"] = InteractiveDiagramConverter.render_interactive_html(
+            package_diagram(summary, depth), args.template,
+            vendor_dir=args.vendor_dir if args.bundle else None,
+            minify=args.bundle,
+            payload=args.payload
+        )
+    
+    if args.type in ['class', 'sequence', 'all']:
+        # Generate Mermaid diagram(s)
+        converter = DiagramConverter(aggregate_edges=not args.keep_duplicate_edges)
+        if args.type in ['class', 'all']:
+            if args.jobs == 1:
+                mermaid_diagrams = converter.convert_class_diagram(puml_content)
+            else:
+                mermaid_diagrams = converter.convert_class_diagram_sharded(puml_content, args.jobs or None)
+        else:
+            mermaid_diagrams = [converter.convert_sequence_diagram(puml_content)]
         
-        # Reconstruct the diagram in the correct order
-        return header + class_definitions + class_contents + relationships
+        for i, diagram in enumerate(mermaid_diagrams, 1):
+            output_file = f"{base_filename}_part{i}.mmd" if len(mermaid_diagrams) > 1 else f"{base_filename}.mmd"
+            outputs[output_file] = diagram
+    
+    return outputs, diagram_data
+
+
+def convert_file(input_file, args, archive=None):
+    """Convert one PlantUML file to the outputs selected on the command line.
+
+    Outputs are added to archive instead of written as files when one is
+    given. Returns the interactive diagram data if it was built, for --site.
+    """
+    print(f"Reading file: {input_file}")
+    puml_content = read_input(input_file, args)
+    outputs, diagram_data = render_outputs(input_file, puml_content, args)
+    if archive is not None:
+        archive.add_outputs(input_file, outputs)
+    
+    mermaid_count = 0
+    chunk_dirs = set()
+    for output_file, text in outputs.items():
+        if archive is not None:
+            output_file = f"{archive.path}:{archive.entry_name(output_file)}"
+        else:
+            if output_file.endswith('.js'):
+                os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(text)
+        if output_file.endswith('.js'):
+            chunk_dirs.add(os.path.dirname(output_file))
+        if args.type == 'packages':
+            print(f"Created package summary: {output_file}")
+        elif output_file.endswith('.mmd'):
+            mermaid_count += 1
+            print(f"Created diagram part {mermaid_count}: {output_file}")
+        elif output_file.endswith('.html'):
+            print(f"Created interactive diagram: {output_file}")
+    for chunk_dir in sorted(chunk_dirs):
+        print(f"Created member chunks: {chunk_dir}")
+    
+    if mermaid_count:
+        diagram_type = 'sequence' if args.type == 'sequence' else 'class'
+        print(f"\nMermaid diagram conversion completed!")
+        print(f"Created {mermaid_count} {diagram_type} diagram{'s' if mermaid_count > 1 else ''}")
+    
+    if args.type == 'all':
+        print("\nAll conversions completed successfully!")
+        print("Generated both Mermaid and interactive HTML diagrams.")
+    
+    return diagram_data
+
+
+def write_site(args, diagram_models):
+    """Build the --site output from already converted diagrams"""
+    index_page = build_site(args.input_files, args.site, args.template,
+                            vendor_dir=args.vendor_dir if args.bundle else None,
+                            aggregate_edges=not args.keep_duplicate_edges,
+                            diagram_models=diagram_models,
+                            resolve_includes=args.resolve_includes)
+    print(f"Created site: {index_page}")
+
+
+def watch(args):
+    """Convert the inputs, then keep regenerating the affected outputs as files change"""
+    if args.mmap:
+        print("Note: --mmap is ignored in watch mode")
+    watcher = InputWatcher(
+        args.input_files,
+        lambda input_file, puml_content: render_outputs(input_file, puml_content, args),
+        after_rebuild=(lambda models: write_site(args, models)) if args.site else None
+    )
+    watcher.run()
+
 
 def main():
     parser = argparse.ArgumentParser(description='Convert PlantUML to various diagram formats')
-    parser.add_argument('input_file', help='Input PlantUML file path')
-    parser.add_argument('--type', '-t', choices=['sequence', 'class', 'interactive', 'all'], 
+    parser.add_argument('input_files', nargs='+', metavar='input_file', help='Input PlantUML file path(s)')
+    parser.add_argument('--type', '-t', choices=['sequence', 'class', 'interactive', 'all', 'packages'], 
                       default='class', help='Type of diagram (default: class)')
+    parser.add_argument('--package-depth', type=int,
+                      help='Package level of --type packages (default: the deepest with at most 100 packages)')
     parser.add_argument('--template', help='Path to HTML template file for interactive diagram',
-                      default='template.html')
+                      default=DEFAULT_TEMPLATE_PATH)
+    parser.add_argument('--bundle', action='store_true',
+                      help='Write self-contained, minified HTML with the needed vendor scripts inlined')
+    parser.add_argument('--vendor-dir', default=DEFAULT_VENDOR_DIR,
+                      help='Directory holding vendor scripts for --bundle (default: vendor/)')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                      help='Worker processes for parsing large class diagrams; '
+                           'only parsing is parallel (0: one per CPU, default: 1)')
+    parser.add_argument('--keep-duplicate-edges', action='store_true',
+                      help='Emit repeated relationships separately instead of one edge with a count')
+    parser.add_argument('--mmap', action='store_true',
+                      help='Memory-map the input file instead of reading it into memory '
+                           '(not with --resolve-includes)')
+    parser.add_argument('--payload', choices=['json', 'columnar'], default='json',
+                      help='Encoding of the data embedded in interactive pages (default: json)')
+    parser.add_argument('--lazy-members', action='store_true',
+                      help='Keep only class skeletons in interactive pages and load members from chunk files on demand '
+                           '(needs a template with the chunk loader, e.g. interactiveClassDiagramViewer.html)')
+    parser.add_argument('--site', metavar='DIR',
+                      help='Write the interactive diagrams of all inputs as one searchable site with shared assets')
+    parser.add_argument('--watch', '-w', action='store_true',
+                      help='Keep running and regenerate the outputs of inputs (or their !include files) that change')
+    parser.add_argument('--resolve-includes', action='store_true',
+                      help='Inline local !include files before converting (always on with --watch)')
+    parser.add_argument('--archive', metavar='PATH',
+                      help='Write the outputs of all inputs into one zip archive with an index instead of separate files')
     
     args = parser.parse_args()
-
-
+    if args.archive and args.watch:
+        parser.error('--archive cannot be combined with --watch')
+    if args.mmap and args.resolve_includes and not args.watch:
+        # A mapped input is parsed as is, so its !include lines could not be inlined
+        parser.error('--mmap cannot be combined with --resolve-includes')
     
-    # Assuming `data` is your diagram's nodes and edges
-    data = {
-            "nodes": [
-                {"data": {"id": "class1", "label": "Class 1"}},
-                {"data": {"id": "class2", "label": "Class 2"}}
-                ],
-                "edges": [
-                {"data": {"source": "class1", "target": "class2", "label": "inherits"}}
-                ]
-            }
-
-    # Serialize data as JSON for embedding in JavaScript
-
-    escaped_data = html.escape(json.dumps(data))
-    serialized_data = escaped_data
-
+    if (args.site or args.type in ['interactive', 'all', 'packages']) and not os.path.exists(args.template):
+        print(f"Warning: Template file {args.template} not found. Using {DEFAULT_TEMPLATE_PATH}")
+        args.template = DEFAULT_TEMPLATE_PATH
+    
+    if args.package_depth is not None:
+        if args.type != 'packages':
+            parser.error('--package-depth only applies to --type packages')
+        if args.package_depth < 1:
+            parser.error('--package-depth must be 1 or more')
+    
+    if args.jobs < 0:
+        parser.error('--jobs must be 0 (one per CPU) or more')
+    
+    if args.lazy_members and args.type in ['interactive', 'all']:
+        if args.payload == 'columnar':
+            parser.error('--lazy-members cannot be combined with --payload columnar')
+        if not template_loads_member_chunks(args.template):
+            parser.error(f'--lazy-members needs a template that loads member chunks, '
+                         f'such as interactiveClassDiagramViewer.html; {args.template} does not')
     
+    if args.watch:
+        watch(args)
+        return
+    
+    archive = ArchiveWriter(args.archive, archive_root(args.input_files)) if args.archive else None
     try:
-        print(f"Reading file: {args.input_file}")
-        with open(args.input_file, 'r', encoding='utf-8') as f:
-            puml_content = f.read()
-        
-        base_filename = os.path.splitext(args.input_file)[0]
+        diagram_models = {}
+        for input_file in args.input_files:
+            diagram_models[input_file] = convert_file(input_file, args, archive)
         
-        # Process based on type
-        if args.type in ['interactive', 'all']:
-            # Generate interactive HTML diagram
-            output_file = f"{base_filename}_interactive.html"
-            
-            if not os.path.exists(args.template):
-                print(f"Warning: Template file {args.template} not found.")
-                # Save the template content from the earlier artifact
-                with open(args.template, 'w', encoding='utf-8') as f:
-                    f.write(TEMPLATE_HTML)  # This should be defined elsewhere in your code
-                print(f"Created template file: {args.template}")
-
-
-                
-            
-            
-            InteractiveDiagramConverter.convert_to_interactive_html(puml_content, args.template, output_file)
-            print(f"Created interactive diagram: {output_file}")
-            print(serialized_data)
-        
-        if args.type in ['class', 'sequence', 'all']:
-            # Generate Mermaid diagram(s)
-            converter = DiagramConverter()
-            if args.type in ['class', 'all']:
-                mermaid_diagrams = converter.convert_class_diagram(puml_content)
-                diagram_type = 'class'
-            else:
-                mermaid_diagrams = [converter.convert_sequence_diagram(puml_content)]
-                diagram_type = 'sequence'
-            
-            # Create output files for each diagram part
-            for i, diagram in enumerate(mermaid_diagrams, 1):
-                output_file = f"{base_filename}_part{i}.mmd" if len(mermaid_diagrams) > 1 else f"{base_filename}.mmd"
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(diagram)
-                print(f"Created diagram part {i}: {output_file}")
-            
-            print(f"\nMermaid diagram conversion completed!")
-            print(f"Created {len(mermaid_diagrams)} {diagram_type} diagram{'s' if len(mermaid_diagrams) > 1 else ''}")
+        if archive is not None:
+            entry_count = archive.close()
+            print(f"Created archive: {args.archive} ({entry_count} files)")
         
-        if args.type == 'all':
-            print("\nAll conversions completed successfully!")
-            print("Generated both Mermaid and interactive HTML diagrams.")
+        if args.site:
+            write_site(args, diagram_models)
         
     except Exception as e:
         print(f"Error: {str(e)}")
         import traceback
         print(traceback.format_exc())
         sys.exit(1)
+    finally:
+        # Also on Ctrl-C: a closed archive has already been moved into place
+        if archive is not None and os.path.exists(archive.temp_path):
+            archive.discard()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
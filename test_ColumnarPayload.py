@@ -0,0 +1,73 @@
+import json
+import unittest
+
+from ColumnarPayload import COLUMNAR_FORMAT, decode_columnar, encode_columnar
+from InteractiveDiagramConverter import InteractiveDiagramConverter
+
+PUML = """
+class com.shop.Order
+-int quantity
++total() : double
+class com.shop.Customer
+interface com.shop.Payable
+com.shop.Order ..|> com.shop.Payable
+com.shop.Customer --> com.shop.Order
+com.shop.Customer --> com.shop.Order
+"""
+
+
+def round_trip(diagram_data: dict) -> dict:
+    """Encode, pass through JSON as the page does, and decode"""
+    return decode_columnar(json.loads(json.dumps(encode_columnar(diagram_data))))
+
+
+class ColumnarRoundTripTest(unittest.TestCase):
+    def test_converter_output(self):
+        diagram_data = InteractiveDiagramConverter().convert_to_interactive(PUML)
+        payload = encode_columnar(diagram_data)
+        self.assertEqual(payload['format'], COLUMNAR_FORMAT)
+        self.assertEqual(len(payload['nodes']['id']), len(diagram_data['nodes']))
+        self.assertEqual(round_trip(diagram_data), diagram_data)
+
+    def test_data_outside_the_columns(self):
+        diagram_data = {
+            'memberChunks': {'count': 2},
+            'nodes': [
+                # Custom label and description, extra key, no position
+                {'data': {'id': 'a.A', 'label': 'Alpha', 'type': 'class', 'description': 'First',
+                          'backgroundColor': '#111111', 'borderColor': '#222222', 'chunk': 1,
+                          'methods': [], 'attributes': []}},
+                # Skeleton without members or description
+                {'data': {'id': 'a.B', 'label': 'B', 'type': 'interface',
+                          'backgroundColor': '#111111', 'borderColor': '#333333',
+                          'position': {'x': 10, 'y': 20}}},
+                # Members with keys the compact form does not hold
+                {'data': {'id': 'C', 'label': 'C', 'type': 'enum', 'description': 'Enum C',
+                          'backgroundColor': '#444444', 'borderColor': '#222222',
+                          'position': {'x': 0, 'y': 0},
+                          'methods': [{'name': 'f', 'visibility': '+', 'params': '', 'static': True}],
+                          'attributes': [{'name': 'x', 'visibility': '-'}]}},
+            ],
+            'edges': [
+                {'data': {'source': 'a.A', 'target': 'a.B', 'type': 'inheritance', 'color': '#111111',
+                          'count': 1, 'label': 'inheritance'}},
+                {'data': {'source': 'a.B', 'target': 'C', 'type': 'association', 'color': '#111111',
+                          'count': 3, 'label': 'association (3x)'}},
+                # No count and a custom label
+                {'data': {'source': 'C', 'target': 'a.A', 'type': 'dependency', 'color': '#444444',
+                          'label': 'uses', 'weight': 2}},
+            ],
+        }
+        self.assertEqual(round_trip(diagram_data), diagram_data)
+
+    def test_empty_diagram(self):
+        diagram_data = {'nodes': [], 'edges': []}
+        self.assertEqual(round_trip(diagram_data), diagram_data)
+
+    def test_other_payloads_pass_through(self):
+        diagram_data = {'nodes': [], 'edges': []}
+        self.assertIs(decode_columnar(diagram_data), diagram_data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+import zipfile
+
+from DiagramArchive import INDEX_NAME, ArchiveReader, ArchiveWriter
+
+OUTPUTS = {
+    'billing/model.puml': {
+        'billing/model.mmd': 'classDiagram\n    class Invoice\n',
+        'billing/model_interactive.html': '<html>Invoice ü</html>',
+    },
+    'model.puml': {
+        'model_part1.mmd': 'classDiagram\n    class A\n',
+        'model_members/chunk_0.js': '',
+    },
+}
+
+
+class DiagramArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+        self.path = os.path.join(self.workdir.name, 'out', 'diagrams.zip')
+
+    def write_archive(self) -> int:
+        writer = ArchiveWriter(self.path, self.workdir.name)
+        for input_file, outputs in OUTPUTS.items():
+            writer.add_outputs(os.path.join(self.workdir.name, input_file),
+                               {os.path.join(self.workdir.name, path): text for path, text in outputs.items()})
+        return writer.close()
+
+    def test_reads_back_every_entry(self):
+        self.assertEqual(self.write_archive(), 4)
+        self.assertFalse(os.path.exists(f"{self.path}.tmp"))
+        with ArchiveReader(self.path) as reader:
+            self.assertEqual(reader.inputs(), {input_file: list(outputs) for input_file, outputs in OUTPUTS.items()})
+            self.assertEqual(sorted(reader.names()), sorted(name for outputs in OUTPUTS.values() for name in outputs))
+            for outputs in OUTPUTS.values():
+                for name, text in outputs.items():
+                    self.assertEqual(reader.read(name), text)
+
+    def test_is_a_valid_zip(self):
+        self.write_archive()
+        with zipfile.ZipFile(self.path) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertIn(INDEX_NAME, archive.namelist())
+            self.assertEqual(archive.read('billing/model.mmd').decode('utf-8'),
+                             OUTPUTS['billing/model.puml']['billing/model.mmd'])
+
+    def test_unknown_entry(self):
+        self.write_archive()
+        with ArchiveReader(self.path) as reader:
+            with self.assertRaises(KeyError):
+                reader.read('missing.mmd')
+
+    def test_rejects_other_zips(self):
+        os.makedirs(os.path.dirname(self.path))
+        with zipfile.ZipFile(self.path, 'w') as archive:
+            archive.writestr('a.txt', 'text')
+        with self.assertRaises(ValueError):
+            ArchiveReader(self.path)
+
+    def test_discard_removes_the_partial_archive(self):
+        writer = ArchiveWriter(self.path, self.workdir.name)
+        writer.add_outputs(os.path.join(self.workdir.name, 'model.puml'),
+                           {os.path.join(self.workdir.name, 'model.mmd'): 'classDiagram\n'})
+        writer.discard()
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from MemberParser import MemberSignature, member_text, parse_member_line
+
+
+class ParseMemberLineTest(unittest.TestCase):
+    # Member line -> expected signature
+    MEMBERS = {
+        '-int count': MemberSignature('-', False, False, 'count', None, 'int', ''),
+        '-count : int': MemberSignature('-', False, False, 'count', None, '', 'int'),
+        '+int count = 0': MemberSignature('+', False, False, 'count', None, 'int', ''),
+        '#String getName()': MemberSignature('#', False, False, 'getName', '', 'String', ''),
+        '+find(String q, int limit) : List<String>':
+            MemberSignature('+', False, False, 'find', 'String q, int limit', '', 'List<String>'),
+        '{static} +Builder builder(String name)':
+            MemberSignature('+', True, False, 'builder', 'String name', 'Builder', ''),
+        '+{classifier} int MAX': MemberSignature('+', True, False, 'MAX', None, 'int', ''),
+        '{abstract} ~void run()': MemberSignature('~', False, True, 'run', '', 'void', ''),
+        'name': MemberSignature('', False, False, 'name', None, '', ''),
+        '': MemberSignature('', False, False, '', None, '', ''),
+    }
+
+    def test_members(self):
+        for line, signature in self.MEMBERS.items():
+            with self.subTest(line=line):
+                self.assertEqual(parse_member_line(line), signature)
+
+    def test_methods_and_types(self):
+        method = parse_member_line('+String getName()')
+        self.assertTrue(method.is_method)
+        self.assertEqual(method.type, 'String')
+        attribute = parse_member_line('-name : String')
+        self.assertFalse(attribute.is_method)
+        self.assertEqual(attribute.type, 'String')
+
+
+class MemberTextTest(unittest.TestCase):
+    def test_keeps_leading_modifiers(self):
+        self.assertEqual(member_text('{static} +Builder builder(String name)'),
+                         '{static} +Builder builder(String name)')
+
+    def test_drops_trailing_brace_and_lone_braces(self):
+        self.assertEqual(member_text('+int count {'), '+int count')
+        self.assertEqual(member_text('{'), '')
+        self.assertEqual(member_text('}'), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
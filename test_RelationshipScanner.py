@@ -0,0 +1,77 @@
+import contextlib
+import io
+import unittest
+
+from RelationshipScanner import MAX_LINE_LENGTH, mermaid_relationship, scan_relationship, within_line_budget
+
+
+class ScanRelationshipTest(unittest.TestCase):
+    # PlantUML line -> (source, target, kind, Mermaid line)
+    ARROWS = {
+        'A --|> B': ('A', 'B', 'inheritance', 'A --|> B'),
+        'A ..|> B': ('A', 'B', 'inheritance', 'A --|> B'),
+        'A <|-- B': ('B', 'A', 'inheritance', 'B --|> A'),
+        'A <|.. B': ('B', 'A', 'inheritance', 'B --|> A'),
+        'A --> B': ('A', 'B', 'association', 'A --> B'),
+        'A <-- B': ('B', 'A', 'association', 'B --> A'),
+        'A ..> B': ('A', 'B', 'dependency', 'A ..> B'),
+        'A <.. B': ('B', 'A', 'dependency', 'B ..> A'),
+        'Car *-- Wheel': ('Car', 'Wheel', 'composition', 'Car *-- Wheel'),
+        'Car *--> Wheel': ('Car', 'Wheel', 'composition', 'Car *-- Wheel'),
+        'Engine --* Car': ('Car', 'Engine', 'composition', 'Car *-- Engine'),
+        'Team o-- Player': ('Team', 'Player', 'aggregation', 'Team o-- Player'),
+        'Team o--> Player': ('Team', 'Player', 'aggregation', 'Team o-- Player'),
+        'Player --o Team': ('Team', 'Player', 'aggregation', 'Team o-- Player'),
+    }
+
+    def test_arrow_shapes(self):
+        for line, (source, target, kind, mermaid) in self.ARROWS.items():
+            with self.subTest(line=line):
+                relationship = scan_relationship(line)
+                self.assertEqual((relationship.source, relationship.target, relationship.kind),
+                                 (source, target, kind))
+                self.assertEqual(mermaid_relationship(line, relationship), mermaid)
+
+    def test_out_of_scope_shapes(self):
+        for line in ['A -- B', 'A .. B', 'A <--> B', 'A *--o B', 'A #-- B', 'A --x B']:
+            with self.subTest(line=line):
+                self.assertIsNone(scan_relationship(line))
+
+    def test_names_next_to_the_arrow(self):
+        relationship = scan_relationship('Foo--> order')
+        self.assertEqual((relationship.source, relationship.target), ('Foo', 'order'))
+        self.assertEqual(scan_relationship('A --order B'), None)
+
+    def test_keeps_label_and_qualified_names(self):
+        line = 'com.a.Car *-- com.b.Wheel : wheels'
+        relationship = scan_relationship(line)
+        self.assertEqual((relationship.source, relationship.target), ('com.a.Car', 'com.b.Wheel'))
+        self.assertEqual(mermaid_relationship(line, relationship), 'com.a.Car *-- com.b.Wheel : wheels')
+
+    def test_not_an_arrow(self):
+        for line in ['com.example.Name', '-field : int', '+get() : List<String>', '-->-->-->']:
+            with self.subTest(line=line):
+                self.assertIsNone(scan_relationship(line))
+
+    def test_long_runs_are_not_arrows(self):
+        self.assertIsNone(scan_relationship('A ' + '-' * 10000 + ' B'))
+        relationship = scan_relationship('a' + '.' * 10000 + ' A --> B')
+        self.assertEqual((relationship.source, relationship.target), ('A', 'B'))
+
+
+class LineBudgetTest(unittest.TestCase):
+    def test_lines_up_to_the_limit_are_parsed(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertTrue(within_line_budget('x' * MAX_LINE_LENGTH))
+        self.assertEqual(output.getvalue(), '')
+
+    def test_longer_lines_are_skipped_with_a_warning(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertFalse(within_line_budget('x' * (MAX_LINE_LENGTH + 1)))
+        self.assertIn(f"{MAX_LINE_LENGTH + 1} characters", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from unittest import mock
+
+from converter import DiagramConverter, parse_shard, split_into_shards
+from InteractiveDiagramConverter import InteractiveDiagramConverter
+from RelationshipScanner import MAX_LINE_LENGTH
+
+# Output of the converter before the parse/emit split, for classes declared with and without braces
+BASELINE_PUML = """@startuml
+interface Drawable {
+}
+class Shape
+Shape ..|> Drawable
+class Circle {
+}
+Circle --|> Shape
+class Square{
+}
+Square --|> Shape
+class Polygon
+-int sides
++area() : double
+Polygon --|> Shape
+@enduml
+"""
+BASELINE_MERMAID = [
+    "classDiagram\n    direction TB\n"
+    "class Drawable\nclass Shape\nclass Circle\nclass Square\nclass Polygon\n"
+    "Drawable : <<interface>>\nPolygon : -sides\nPolygon : +area()\n"
+    "Shape --|> Drawable\nCircle --|> Shape\nSquare --|> Shape\nPolygon --|> Shape"
+]
+
+
+class ConvertClassDiagramTest(unittest.TestCase):
+    def test_matches_baseline_output(self):
+        self.assertEqual(DiagramConverter().convert_class_diagram(BASELINE_PUML), BASELINE_MERMAID)
+
+    def test_brace_is_not_the_class_name(self):
+        converter = DiagramConverter()
+        for line in ['class Foo {', 'class Foo{', 'class p.q.Foo {', 'interface Foo {']:
+            with self.subTest(line=line):
+                self.assertEqual(converter.parse_class_definition(line)[0], 'Foo')
+
+    def test_members_of_brace_declarations(self):
+        mermaid = DiagramConverter().convert_class_diagram("class p.q.C {\n-int count\n}\n")[0]
+        self.assertEqual(mermaid.splitlines()[2:], ['class C', 'C : -count'])
+
+    def test_never_emits_an_empty_class_name(self):
+        mermaid = DiagramConverter().convert_class_diagram("class {\n-int count\n}\nclass Foo\n")[0]
+        self.assertNotIn('class', mermaid.splitlines()[2:])
+        self.assertEqual(mermaid.splitlines()[2:], ['class Foo'])
+
+
+class OverlongClassLineTest(unittest.TestCase):
+    # The overlong class line must not take over the members that follow it
+    PUML = '\n'.join([
+        'class Kept',
+        '-int first',
+        'class ' + 'X' * MAX_LINE_LENGTH,
+        '-int second',
+        'class Other',
+        '-int third',
+    ]) + '\n'
+
+    def test_members_stay_with_the_previous_class(self):
+        events = list(DiagramConverter().parse_class_lines(self.PUML.splitlines()))
+        members = [event[1] for event in events if event[0] == 'member' and not event[1].startswith('%%')]
+        self.assertEqual(members, ['Kept : -first', 'Kept : -second', 'Other : -third'])
+
+        diagram = InteractiveDiagramConverter().convert_to_interactive(self.PUML)
+        attributes = {node['data']['id']: [attribute['name'] for attribute in node['data']['attributes']]
+                      for node in diagram['nodes']}
+        self.assertEqual(attributes, {'Kept': ['first', 'second'], 'Other': ['third']})
+
+    def test_shards_match_serial_parsing(self):
+        serial = list(DiagramConverter().parse_class_lines(self.PUML.splitlines()))
+        with mock.patch('converter.MIN_SHARD_SIZE', 1):
+            shards = split_into_shards(self.PUML, len(self.PUML))
+        self.assertEqual(len(shards), len(self.PUML.splitlines()))
+        sharded = [event for shard in shards for event in parse_shard(shard)]
+        self.assertEqual(sharded, serial)
+
+
+if __name__ == '__main__':
+    unittest.main()